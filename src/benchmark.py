@@ -0,0 +1,141 @@
+"""
+Headless frame benchmark
+
+Runs the game loop without a window, audio device or keyboard and reports
+per-phase frame timings as JSON. Run from the repository root:
+
+    python src/benchmark.py --frames 600 --scale 1 10 100
+"""
+import argparse
+import json
+import os
+import sys
+import time
+
+# Select SDL's dummy drivers before pygame is imported anywhere
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+os.environ.setdefault('SDL_AUDIODRIVER', 'dummy')
+
+import pygame
+from config import config
+from core.camera import Camera
+from core.culling import ViewCuller
+from physics.world import PhysicsWorld
+from physics.lod import SimulationLOD
+from ui.overlay import GameUI
+import main as game
+
+PHASES = ['physics', 'entity_update', 'background', 'entities_draw', 'ui']
+
+def scripted_input(frame):
+    """Run right, jumping at a steady rhythm and turning around every ten seconds"""
+    direction = 1 if (frame // 600) % 2 == 0 else -1
+    jump = frame % 40 == 0
+    return direction, jump
+
+def summarize(samples):
+    """Return summary statistics (in milliseconds) for a list of timings in seconds"""
+    ordered = sorted(samples)
+    count = len(ordered)
+
+    def percentile(p):
+        return ordered[min(count - 1, int(p * count))] * 1000.0
+
+    return {
+        'total_ms': sum(ordered) * 1000.0,
+        'mean_ms': sum(ordered) * 1000.0 / count,
+        'p50_ms': percentile(0.50),
+        'p95_ms': percentile(0.95),
+        'p99_ms': percentile(0.99),
+        'max_ms': ordered[-1] * 1000.0,
+    }
+
+def run_scenario(screen, background, copies, frames, input_script=scripted_input):
+    """Simulate and draw a level repeated `copies` times for a number of frames"""
+    physics_world = PhysicsWorld()
+    level = game.load_level_data()
+    camera = Camera(level.width * copies, level.height)
+    view_culler = ViewCuller(camera, margin=32)
+    simulation_lod = SimulationLOD(camera)
+    ui = GameUI()
+    game.load_level(physics_world, copies)
+
+    # Every rendered frame advances exactly one fixed physics step
+    frame_time = physics_world.time_step
+    timings = {phase: [] for phase in PHASES}
+    frame_totals = []
+    clock = time.perf_counter
+
+    for frame in range(frames):
+        pygame.event.pump()
+        direction, jump = input_script(frame)
+        frame_start = clock()
+
+        if jump:
+            game.player.jump()
+        game.update_physics(physics_world, frame_time, direction)
+        after_physics = clock()
+
+        game.update_entities(physics_world, camera, simulation_lod)
+        after_update = clock()
+
+        ui.update_coin_count(game.player.coins)
+        screen.fill(config.BLACK)
+        background.draw(screen, camera)
+        after_background = clock()
+
+        game.draw_entities(screen, camera, view_culler)
+        after_entities = clock()
+
+        ui.draw(screen)
+        pygame.display.flip()
+        frame_end = clock()
+
+        timings['physics'].append(after_physics - frame_start)
+        timings['entity_update'].append(after_update - after_physics)
+        timings['background'].append(after_background - after_update)
+        timings['entities_draw'].append(after_entities - after_background)
+        timings['ui'].append(frame_end - after_entities)
+        frame_totals.append(frame_end - frame_start)
+
+    total_seconds = sum(frame_totals)
+    return {
+        'scenario': f'{copies}x',
+        'frames': frames,
+        'bodies': physics_world.world.bodyCount,
+        'platforms': len(game.platforms),
+        'enemies': len(game.enemies),
+        'collectibles': len(game.collectibles),
+        'fps': frames / total_seconds if total_seconds else 0.0,
+        'frame': summarize(frame_totals),
+        'phases': {phase: summarize(samples) for phase, samples in timings.items()},
+    }
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Headless per-phase frame benchmark")
+    parser.add_argument('--frames', type=int, default=600, help="Frames to simulate per scenario")
+    parser.add_argument('--scale', type=int, nargs='+', default=[1, 10, 100],
+                        help="Level multipliers to run (number of side-by-side level copies)")
+    parser.add_argument('--output', help="Write the JSON report to this file instead of stdout")
+    args = parser.parse_args(argv)
+
+    pygame.init()
+    screen = pygame.display.set_mode((config.WINDOW_WIDTH, config.WINDOW_HEIGHT))
+    background = game.create_background()
+
+    report = {
+        'window': [config.WINDOW_WIDTH, config.WINDOW_HEIGHT],
+        'physics_tick_rate': config.PHYSICS_TICK_RATE,
+        'scenarios': [run_scenario(screen, background, copies, args.frames) for copies in args.scale],
+    }
+    pygame.quit()
+
+    text = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, 'w') as f:
+            f.write(text)
+    else:
+        print(text)
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
@@ -0,0 +1,25 @@
+"""
+Level compiler
+
+Turns a JSON level into the compact binary form the game loads. Run from the
+repository root:
+
+    python src/compile_level.py assets/levels/level1.json
+"""
+import argparse
+import sys
+from core.level_file import LevelData
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Compile a JSON level into its binary form")
+    parser.add_argument('source', help="JSON level file")
+    parser.add_argument('--output', help="Compiled level to write (default: the source path with .lvl)")
+    args = parser.parse_args(argv)
+
+    output = args.output or args.source.rsplit('.', 1)[0] + '.lvl'
+    level = LevelData.from_json(args.source)
+    level.save(output)
+    print(f"Wrote {output}: {len(level)} chunks")
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
@@ -0,0 +1,68 @@
+import math
+import pygame
+
+try:
+    import numpy as np
+except ImportError:  # Fall back to evaluating animations one at a time
+    np = None
+
+class AnimationSystem:
+    def __init__(self):
+        """
+        Evaluates every sine-driven animation from a single clock sample per frame.
+
+        Animation parameters live in parallel lists (and NumPy arrays when available);
+        update() writes sin(ticks * speed) * amplitude for all of them into `values`,
+        which animations read at draw time.
+        """
+        self.speeds = []
+        self.amplitudes = []
+        self.values = []
+        self.ticks = 0
+        self._free = []  # Indices of removed animations, reused by add()
+        self._speed_array = None
+        self._amplitude_array = None
+
+    def add(self, amplitude, speed):
+        """Register an animation and return its index into `values`"""
+        self._speed_array = None
+        if self._free:
+            index = self._free.pop()
+            self.speeds[index] = speed
+            self.amplitudes[index] = amplitude
+            return index
+        self.speeds.append(speed)
+        self.amplitudes.append(amplitude)
+        self.values.append(0.0)
+        return len(self.speeds) - 1
+
+    def remove(self, index):
+        """Free an animation's slot so a later add() can reuse it"""
+        self.speeds[index] = 0.0
+        self.amplitudes[index] = 0.0
+        self._free.append(index)
+        self._speed_array = None
+
+    def clear(self):
+        """Forget all animations (e.g. before a new level is built)"""
+        self.speeds.clear()
+        self.amplitudes.clear()
+        self.values = []
+        self._free.clear()
+        self._speed_array = None
+
+    def update(self, ticks=None):
+        """Sample the clock once and evaluate every animation"""
+        self.ticks = pygame.time.get_ticks() if ticks is None else ticks
+        if np is not None:
+            if self._speed_array is None:
+                self._speed_array = np.array(self.speeds, dtype=float)
+                self._amplitude_array = np.array(self.amplitudes, dtype=float)
+            self.values = (np.sin(self._speed_array * self.ticks) * self._amplitude_array).tolist()
+        else:
+            ticks = self.ticks
+            self.values = [math.sin(ticks * speed) * amplitude
+                           for speed, amplitude in zip(self.speeds, self.amplitudes)]
+
+# Create a global instance
+animation_system = AnimationSystem()
@@ -1,29 +1,45 @@
-import math
-import pygame
+from .animation_system import animation_system
 
 class FloatingAnimation:
+    is_render_transform = True  # Applied to the drawn rect, never to the object's rect
+
     def __init__(self, amplitude=1, speed=0.0001):
         self.game_object = None
         self.amplitude = amplitude
         self.speed = speed
+        self.index = animation_system.add(amplitude, speed)
 
     def update(self):
-        offset = math.sin(pygame.time.get_ticks() * self.speed) * self.amplitude
-        self.game_object.rect.y = self.game_object.original_y + offset
+        # Evaluated in bulk by animation_system
+        pass
+
+    def apply(self, rect):
+        """Offset a render rect by the current float height"""
+        rect.y += animation_system.values[self.index]
+
+    def release(self):
+        animation_system.remove(self.index)
 
 class PulsingAnimation:
+    is_render_transform = True  # Applied to the drawn rect, never to the object's rect
+
     def __init__(self, scale_range=0.15, speed=0.003):
         self.game_object = None
         self.scale_range = scale_range
         self.speed = speed
-        self.original_size = None
+        self.index = animation_system.add(scale_range, speed)
 
     def update(self):
-        if self.original_size is None:
-            self.original_size = (self.game_object.rect.width, self.game_object.rect.height)
-        
-        scale = 1 + math.sin(pygame.time.get_ticks() * self.speed) * self.scale_range
-        center = self.game_object.rect.center
-        self.game_object.rect.width = int(self.original_size[0] * scale)
-        self.game_object.rect.height = int(self.original_size[1] * scale)
-        self.game_object.rect.center = center
\ No newline at end of file
+        # Evaluated in bulk by animation_system
+        pass
+
+    def apply(self, rect):
+        """Scale a render rect about its center by the current pulse"""
+        scale = 1 + animation_system.values[self.index]
+        center = rect.center
+        rect.width = int(rect.width * scale)
+        rect.height = int(rect.height * scale)
+        rect.center = center
+
+    def release(self):
+        animation_system.remove(self.index)
@@ -41,9 +41,28 @@ class Config:
             self.WINDOW_HEIGHT = config['window']['height']
             self.FPS = config['window']['fps']
 
+            # Physics settings
+            self.PHYSICS_TICK_RATE = config['physics']['tick_rate']
+            self.MAX_PHYSICS_STEPS = config['physics']['max_steps_per_frame']
+
             # Level settings
             self.LEVEL_WIDTH = config['level']['width']
             self.LEVEL_HEIGHT = config['level']['height']
+            self.LEVEL_FILE = config['level']['file']
+
+            # Level chunk streaming settings
+            self.STREAMING_ENABLED = config['streaming']['enabled']
+            self.STREAM_LOAD_MARGIN = config['streaming']['load_margin']
+            self.STREAM_UNLOAD_MARGIN = config['streaming']['unload_margin']
+            self.STREAM_BATCH_SIZE = config['streaming']['batch_size']
+
+            # Procedural level generator settings
+            self.GENERATOR_CHUNK_WIDTH = config['generator']['chunk_width']
+            self.GENERATOR_LOOKAHEAD = config['generator']['lookahead']
+            self.GENERATOR_MAX_CHUNKS = config['generator']['max_chunks']
+
+            # Asset settings
+            self.ASSET_CACHE_DIR = config['assets']['cache_dir']
 
             # Colors
             self.WHITE = tuple(config['colors']['white'])
@@ -61,6 +80,25 @@ class Config:
 
             # Enemy settings
             self.ENEMY_SPEED_MULTIPLIER = config['enemy']['speed_multiplier']
+
+            # Collision layers: category names and which categories each one collides with
+            self.COLLISION_CATEGORIES = config['collision']['categories']
+            self.COLLISION_MASKS = config['collision']['masks']
+
+            # Simulation level-of-detail settings
+            self.LOD_ACTIVATION_MARGIN = config['lod']['activation_margin']
+            self.LOD_DEACTIVATION_MARGIN = config['lod']['deactivation_margin']
+
+            # Enemy AI scheduling settings
+            self.AI_GROUPS = config['ai']['groups']
+            self.AI_NEAR_DISTANCE = config['ai']['near_distance']
+            self.AI_FAR_DISTANCE = config['ai']['far_distance']
+            self.AI_FAR_INTERVAL = config['ai']['far_interval']
+            self.AI_BUDGET_MS = config['ai']['budget_ms']
+
+            # Profiler settings
+            self.PROFILER_WINDOW = config['profiler']['window']
+            self.PROFILER_EXPORT_PATH = config['profiler']['export_path']
             
         except KeyError as e:
             print(f"Error: Missing required configuration key: {e}")
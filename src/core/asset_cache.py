@@ -0,0 +1,88 @@
+import hashlib
+import mmap
+import os
+import struct
+import pygame
+from config import config
+
+# Cache file layout: header followed by raw RGBA rows
+HEADER = struct.Struct('<4sIIIq')  # magic, version, width, height, source mtime_ns
+MAGIC = b'WRIC'
+VERSION = 1
+
+_to_bytes = getattr(pygame.image, 'tobytes', None) or pygame.image.tostring
+
+class ImageCache:
+    def __init__(self, cache_dir=None):
+        """
+        On-disk cache of preprocessed (scaled) images stored as raw RGBA pixels
+
+        Args:
+            cache_dir: Directory for cache files, relative paths are taken from the
+                repository root. Defaults to the configured asset cache directory.
+        """
+        cache_dir = cache_dir or config.ASSET_CACHE_DIR
+        if not os.path.isabs(cache_dir):
+            cache_dir = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(__file__))), cache_dir)
+        self.cache_dir = cache_dir
+
+    def _cache_path(self, image_path, scale):
+        # One file per source/window/scale combination; the source mtime lives in the
+        # header so edited images overwrite their old entry instead of piling up
+        key = f"{os.path.abspath(image_path)}|{config.WINDOW_WIDTH}x{config.WINDOW_HEIGHT}|{scale}"
+        return os.path.join(self.cache_dir, hashlib.sha1(key.encode('utf-8')).hexdigest() + '.rgba')
+
+    def _read(self, cache_path, mtime_ns):
+        with open(cache_path, 'rb') as f:
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data:
+                if len(data) < HEADER.size:
+                    return None
+                magic, version, width, height, cached_mtime = HEADER.unpack_from(data)
+                if magic != MAGIC or version != VERSION or cached_mtime != mtime_ns:
+                    return None
+                if len(data) != HEADER.size + width * height * 4:
+                    return None
+
+                # Wrap the mapped pixels directly, then copy into display format
+                pixels = memoryview(data)[HEADER.size:]
+                source = pygame.image.frombuffer(pixels, (width, height), 'RGBA')
+                image = source.convert_alpha()
+                del source
+                pixels.release()
+                return image
+
+    def _write(self, cache_path, image, mtime_ns):
+        os.makedirs(self.cache_dir, exist_ok=True)
+        width, height = image.get_size()
+        temp_path = cache_path + '.tmp'
+        with open(temp_path, 'wb') as f:
+            f.write(HEADER.pack(MAGIC, VERSION, width, height, mtime_ns))
+            f.write(_to_bytes(image, 'RGBA'))
+        os.replace(temp_path, cache_path)
+
+    def load(self, image_path, scale, build):
+        """
+        Return the preprocessed image for image_path at scale
+
+        Args:
+            image_path: Source image file
+            scale: Scale factor the image is prepared at (part of the cache key)
+            build: Called as build(image_path, scale) to decode and scale the image
+                when there is no valid cache entry
+        """
+        cache_path = self._cache_path(image_path, scale)
+        mtime_ns = os.stat(image_path).st_mtime_ns
+
+        try:
+            image = self._read(cache_path, mtime_ns)
+            if image is not None:
+                return image
+        except (OSError, ValueError):
+            pass  # Missing or unreadable entry, rebuild it below
+
+        image = build(image_path, scale)
+        try:
+            self._write(cache_path, image, mtime_ns)
+        except OSError as e:
+            print(f"Warning: Could not write image cache for {image_path}: {e}")
+        return image
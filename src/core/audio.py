@@ -1,5 +1,119 @@
-import pygame
+import json
 import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+import pygame
+
+class SoundSpec:
+    def __init__(self, name, file, max_voices=1, priority=0, reserved=False):
+        """
+        Playback settings for one sound from the manifest
+
+        Args:
+            name: Name the sound is played by
+            file: File name inside the sounds directory
+            max_voices: Most copies of this sound allowed to play at once
+            priority: Higher priority sounds may take channels from lower ones
+            reserved: Give the sound its own channel that nothing else uses
+        """
+        self.name = name
+        self.file = file
+        self.max_voices = max_voices
+        self.priority = priority
+        self.reserved = reserved
+
+# Posted by pygame.mixer.music whenever a track finishes (or fades out)
+MUSIC_END = pygame.USEREVENT + 1
+
+class MusicPlayer:
+    def __init__(self, playlist=None, crossfade_ms=2000, volume=0.5):
+        """
+        Streams a playlist through pygame.mixer.music so memory use does not
+        depend on track length. The mixer has a single music stream, so a
+        crossfade is the outgoing track fading out followed by the next fading in.
+        update() starts that fade crossfade_ms before a track ends once the
+        track's length is known; until then tracks follow each other via the
+        mixer's queue without a fade.
+
+        Args:
+            playlist: Paths of the tracks to play in order, looping at the end
+            crossfade_ms: Fade applied when starting, stopping or changing tracks
+            volume: Music volume between 0 and 1
+        """
+        self.playlist = list(playlist or [])
+        self.crossfade_ms = crossfade_ms
+        self.volume = volume
+        self.track_lengths = {}  # Track path -> length in seconds, filled in by the audio loader
+        self.index = 0
+        self.playing = False
+        self.paused = False
+        self._skipping = False
+
+    def _next_index(self, index):
+        return (index + 1) % len(self.playlist)
+
+    def _queue_next(self):
+        # Open the next track's stream now so the switch at the end never stalls
+        if len(self.playlist) > 1:
+            pygame.mixer.music.queue(self.playlist[self._next_index(self.index)])
+
+    def play(self, index=0):
+        """Start streaming the playlist from a track, fading it in"""
+        if not self.playlist:
+            return
+        self.index = index % len(self.playlist)
+        try:
+            pygame.mixer.music.load(self.playlist[self.index])
+            pygame.mixer.music.set_volume(self.volume)
+            pygame.mixer.music.set_endevent(MUSIC_END)
+            pygame.mixer.music.play(loops=0 if len(self.playlist) > 1 else -1, fade_ms=self.crossfade_ms)
+            self._queue_next()
+        except pygame.error as e:
+            print(f"Warning: Could not play music: {e}")
+            return
+        self.playing = True
+        self.paused = False
+
+    def next_track(self):
+        """Fade the current track out and fade the next one in"""
+        if self.playing and not self.paused:
+            # fadeout() drops the queued track, so handle_event starts the next one
+            self._skipping = True
+            pygame.mixer.music.fadeout(self.crossfade_ms)
+
+    def update(self):
+        """Fade into the next track when the current one is about to end; call once per frame"""
+        if not self.playing or self.paused or self._skipping or len(self.playlist) < 2:
+            return
+        length = self.track_lengths.get(self.playlist[self.index])
+        if length is not None and pygame.mixer.music.get_pos() >= length * 1000 - self.crossfade_ms:
+            self.next_track()
+
+    def stop(self):
+        self.playing = False
+        pygame.mixer.music.fadeout(self.crossfade_ms)
+
+    def pause(self):
+        if self.playing and not self.paused:
+            pygame.mixer.music.pause()
+            self.paused = True
+
+    def resume(self):
+        if self.playing and self.paused:
+            pygame.mixer.music.unpause()
+            self.paused = False
+
+    def handle_event(self, event):
+        """Advance the playlist when the mixer reports the end of a track"""
+        if event.type != MUSIC_END or not self.playing or len(self.playlist) < 2:
+            return
+        if self._skipping:
+            self._skipping = False
+            self.play(self._next_index(self.index))
+            return
+        # The queued track has already started; queue the one after it
+        self.index = self._next_index(self.index)
+        self._queue_next()
 
 class AudioManager:
     _instance = None
@@ -10,30 +124,129 @@ class AudioManager:
             cls._instance = cls()
         return cls._instance
 
-    def __init__(self):
+    def __init__(self, max_workers=4):
         if AudioManager._instance is not None:
             raise Exception("AudioManager is a singleton!")
+        AudioManager._instance = self
         pygame.mixer.init()
         self.sounds = {}
-        self._load_sounds()
-        
-    def _load_sounds(self):
-        """Load all sound files"""
-        sounds_dir = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(__file__))), 'assets', 'sounds')
-        
+        self.specs = {}
+        self.voices = {}  # Sound name -> channels it is currently playing on
+        self.reserved_channels = {}  # Sound name -> its dedicated channel
+        self._lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='audio-loader')
+        self._pending = []
+        manifest = self._read_manifest()
+        self._load_sounds(manifest)
+        self.music = self._create_music_player(manifest)
+        self._executor.shutdown(wait=False)
+
+    def _sounds_dir(self):
+        return os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(__file__))), 'assets', 'sounds')
+
+    def _read_manifest(self):
+        """Read audio settings from assets/sounds/manifest.json"""
+        manifest_path = os.path.join(self._sounds_dir(), 'manifest.json')
+        try:
+            with open(manifest_path, 'r') as f:
+                return json.load(f)
+        except (OSError, json.JSONDecodeError) as e:
+            print(f"Warning: Could not load sound manifest: {e}")
+            return {}
+
+    def _create_music_player(self, manifest):
+        settings = manifest.get('music', {})
+        playlist = [os.path.join(self._sounds_dir(), track) for track in settings.get('playlist', [])]
+        music = MusicPlayer(playlist, settings.get('crossfade_ms', 2000), settings.get('volume', 0.5))
+        for track in playlist:
+            self._executor.submit(self._measure_track, music, track)
+        return music
+
+    def _measure_track(self, music, path):
+        """Runs on a loader thread; decodes a track once to learn when to start its crossfade"""
+        try:
+            length = pygame.mixer.Sound(path).get_length()
+        except pygame.error as e:
+            print(f"Warning: Could not read length of {os.path.basename(path)}: {e}")
+            return
+        music.track_lengths[path] = length
+
+    def _setup_channels(self, num_channels, specs):
+        """Allocate mixer channels, keeping the first ones for reserved sounds"""
+        reserved = [spec for spec in specs if spec.reserved]
+        pygame.mixer.set_num_channels(max(num_channels, len(reserved) + 1))
+        pygame.mixer.set_reserved(len(reserved))
+        for index, spec in enumerate(reserved):
+            self.reserved_channels[spec.name] = pygame.mixer.Channel(index)
+
+    def _load_sounds(self, manifest):
+        """Start decoding all sound files in the background, most important first"""
+        specs = [SoundSpec(name, **settings) for name, settings in manifest.get('sounds', {}).items()]
+        self._setup_channels(manifest.get('channels', 8), specs)
+        sounds_dir = self._sounds_dir()
+
+        for spec in sorted(specs, key=lambda spec: spec.priority, reverse=True):
+            self.specs[spec.name] = spec
+            self.voices[spec.name] = []
+            self._pending.append(self._executor.submit(self._load_sound, spec, os.path.join(sounds_dir, spec.file)))
+
+    def _load_sound(self, spec, path):
+        """Runs on a loader thread; registers the sound once it is decoded"""
         try:
-            self.sounds['jump'] = pygame.mixer.Sound(os.path.join(sounds_dir, 'jump.mp3'))
-            self.sounds['coin'] = pygame.mixer.Sound(os.path.join(sounds_dir, 'coin.mp3'))
-            self.sounds['magic-boost'] = pygame.mixer.Sound(os.path.join(sounds_dir, 'magic-boost.mp3'))
-            self.sounds['expire'] = pygame.mixer.Sound(os.path.join(sounds_dir, 'expire.mp3'))
-            self.sounds['pause'] = pygame.mixer.Sound(os.path.join(sounds_dir, 'pause.mp3'))
-            self.sounds['unpause'] = pygame.mixer.Sound(os.path.join(sounds_dir, 'unpause.mp3'))
-            self.sounds['death'] = pygame.mixer.Sound(os.path.join(sounds_dir, 'death.mp3'))
+            sound = pygame.mixer.Sound(path)
         except pygame.error as e:
-            print(f"Warning: Could not load jump sound: {e}")
-            self.sounds['jump'] = None
-    
+            print(f"Warning: Could not load {spec.name} sound: {e}")
+            return
+        with self._lock:
+            self.sounds[spec.name] = sound
+
+    def wait_until_loaded(self, timeout=None):
+        """Block until every queued sound has finished loading"""
+        for future in self._pending:
+            future.result(timeout)
+
+    def _active_voices(self, sound_name, sound):
+        voices = self.voices[sound_name]
+        voices[:] = [channel for channel in voices if channel.get_busy() and channel.get_sound() is sound]
+        return voices
+
+    def _steal_channel(self, priority):
+        """Stop the lowest-priority voice below `priority` and return its channel"""
+        victim_name, victim_channel, victim_priority = None, None, priority
+        for name in self.voices:
+            spec = self.specs[name]
+            if spec.reserved or spec.priority >= victim_priority:
+                continue
+            # Drop channels that finished this sound, or were since reused for another one
+            voices = self._active_voices(name, self.sounds.get(name))
+            if voices:
+                victim_name, victim_channel, victim_priority = name, voices[0], spec.priority
+        if victim_channel is None:
+            return None
+        victim_channel.stop()
+        self.voices[victim_name].remove(victim_channel)
+        return victim_channel
+
     def play_sound(self, sound_name):
-        """Play a sound by name"""
-        if sound := self.sounds.get(sound_name):
-            sound.play() 
\ No newline at end of file
+        """Play a sound by name, respecting its voice limit, priority and reserved channel"""
+        sound = self.sounds.get(sound_name)
+        if sound is None:
+            return  # Unknown, failed, or still loading
+
+        spec = self.specs[sound_name]
+        if spec.reserved:
+            self.reserved_channels[sound_name].play(sound)
+            return
+
+        # Restart the oldest voice instead of stacking more copies of the same sound
+        voices = self._active_voices(sound_name, sound)
+        if len(voices) >= spec.max_voices:
+            channel = voices.pop(0)
+            channel.stop()
+        else:
+            channel = pygame.mixer.find_channel() or self._steal_channel(spec.priority)
+            if channel is None:
+                return  # Everything playing is at least as important
+
+        channel.play(sound)
+        voices.append(channel)
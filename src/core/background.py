@@ -1,3 +1,4 @@
+import math
 import pygame
 from enum import Enum
 from config import config
@@ -8,36 +9,65 @@ class TileMode(Enum):
     VERTICAL = 2
     BOTH = 3
 
+# Widest strip we are willing to build when merging tiled layers of different widths
+MAX_STRIP_WIDTH = 8192
+
+def is_opaque(surface):
+    """Return True if every pixel of a per-pixel-alpha surface is fully opaque"""
+    width, height = surface.get_size()
+    return pygame.mask.from_surface(surface, 254).count() == width * height
+
+def load_scaled_image(image_path, scale=1.0):
+    """Decode an image and scale it to the window height, then by scale"""
+    image = pygame.image.load(image_path).convert_alpha()
+
+    # First scale to match window height
+    height_scale = config.WINDOW_HEIGHT / image.get_height()
+    new_width = int(image.get_width() * height_scale)
+    new_height = config.WINDOW_HEIGHT
+    image = pygame.transform.scale(image, (new_width, new_height))
+
+    # Then apply additional scaling if requested
+    if scale != 1.0:
+        new_width = int(image.get_width() * scale)
+        new_height = int(image.get_height() * scale)
+        image = pygame.transform.scale(image, (new_width, new_height))
+    return image
+
 class BackgroundLayer:
-    def __init__(self, image_path, distance, tile_mode=TileMode.NONE, scale=1.0, x_offset=0, y_offset=0):
+    def __init__(self, image_path, distance, tile_mode=TileMode.NONE, scale=1.0, x_offset=0, y_offset=0,
+                 image_cache=None):
         """
         Initialize a background layer
-        
+
         Args:
             image_path: Path to the image file
             distance: Float between 0 and 1, where 1 is furthest (moves least)
             tile_mode: TileMode enum indicating how the image should be tiled
             scale: Scale factor for the image (after height scaling)
             y_offset: Pixels from top of screen to draw the image
+            image_cache: Optional ImageCache holding the already scaled pixels
         """
-        self.image = pygame.image.load(image_path).convert_alpha()
+        if image_cache:
+            image = image_cache.load(image_path, scale, load_scaled_image)
+        else:
+            image = load_scaled_image(image_path, scale)
+
+        self._init_from_image(image, distance, tile_mode, x_offset, y_offset)
+
+    @classmethod
+    def from_surface(cls, image, distance, tile_mode=TileMode.NONE, x_offset=0, y_offset=0):
+        """Create a layer from an already prepared surface"""
+        layer = cls.__new__(cls)
+        layer._init_from_image(image, distance, tile_mode, x_offset, y_offset)
+        return layer
+
+    def _init_from_image(self, image, distance, tile_mode, x_offset, y_offset):
+        self.image = image
         self.tile_mode = tile_mode
-        
-        # First scale to match window height
-        height_scale = config.WINDOW_HEIGHT / self.image.get_height()
-        new_width = int(self.image.get_width() * height_scale)
-        new_height = config.WINDOW_HEIGHT
-        self.image = pygame.transform.scale(self.image, (new_width, new_height))
-        
-        # Then apply additional scaling if requested
-        if scale != 1.0:
-            new_width = int(self.image.get_width() * scale)
-            new_height = int(self.image.get_height() * scale)
-            self.image = pygame.transform.scale(self.image, (new_width, new_height))
-        
         self.distance = max(0.1, min(distance, 1.0))  # Clamp between 0.1 and 1
         self.width = self.image.get_width()
-        
+
         # Only calculate number of copies if tiling horizontally
         if tile_mode in [TileMode.HORIZONTAL, TileMode.BOTH]:
             self.num_copies = (config.LEVEL_WIDTH // self.width) + 3
@@ -47,58 +77,164 @@ class BackgroundLayer:
         self.x_offset = x_offset
         self.y_offset = y_offset
         self.height = self.image.get_height()
-        
+
         # Calculate number of vertical copies if tiling vertically
         if tile_mode in [TileMode.VERTICAL, TileMode.BOTH]:
             self.vertical_copies = (config.LEVEL_HEIGHT // self.height) + 3
         else:
             self.vertical_copies = 1
 
+    def tile_positions(self, parallax_x, parallax_y):
+        """Return the screen positions this layer's copies are drawn at"""
+        positions = []
+        if self.tile_mode in [TileMode.HORIZONTAL, TileMode.BOTH]:
+            start_x = parallax_x % self.width
+
+            if self.tile_mode == TileMode.BOTH:
+                # Handle both horizontal and vertical tiling
+                start_y = parallax_y % self.height
+                for i in range(self.num_copies):
+                    for j in range(self.vertical_copies):
+                        x = start_x + (i * self.width)
+                        y = start_y + (j * self.height)
+                        if x > config.WINDOW_WIDTH: break
+                        if y > config.WINDOW_HEIGHT: continue
+                        positions.append((x, y))
+            else:
+                # Horizontal only tiling
+                for i in range(self.num_copies):
+                    x = start_x + (i * self.width)
+                    if x > config.WINDOW_WIDTH: break
+                    positions.append((x, parallax_y))
+
+        elif self.tile_mode == TileMode.VERTICAL:
+            # Vertical only tiling
+            start_y = parallax_y % self.height
+            for j in range(self.vertical_copies):
+                y = start_y + (j * self.height)
+                if y > config.WINDOW_HEIGHT: break
+                positions.append((parallax_x, y))
+        else:
+            # No tiling
+            positions.append((parallax_x, parallax_y))
+        return positions
+
 class ParallaxBackground:
-    def __init__(self):
+    def __init__(self, composite=False, merge_tolerance=0.01, cache_frames=False, image_cache=None):
+        """
+        Args:
+            composite: Merge layers at near-identical distances into cached strips and
+                store fully opaque layers without per-pixel alpha
+            merge_tolerance: Maximum distance difference for two layers to be merged
+            cache_frames: Keep the rendered background and only redraw it once some
+                layer has moved by at least one pixel
+            image_cache: Optional ImageCache so layers skip decoding and rescaling on
+                later launches
+        """
         self.layers = []
+        self.image_cache = image_cache
+        self.composite = composite
+        self.merge_tolerance = merge_tolerance
+        self.cache_frames = cache_frames
+
+        self._draw_layers = None  # Layers actually drawn, built lazily from self.layers
+        self._frame_cache = None
+        self._frame_key = None
 
     def add_layer(self, image_path, distance, tile_mode=TileMode.NONE, scale=1.0, x_offset=0, y_offset=0):
         """Add a new background layer"""
-        layer = BackgroundLayer(image_path, distance, tile_mode, scale, x_offset, y_offset)
+        layer = BackgroundLayer(image_path, distance, tile_mode, scale, x_offset, y_offset, self.image_cache)
         self.layers.append(layer)
         # Sort layers by distance (furthest first)
         self.layers.sort(key=lambda x: x.distance, reverse=True)
+        self._draw_layers = None
+        self._frame_key = None
 
-    def draw(self, screen, camera):
-        """Draw all background layers with parallax effect"""
+    def _merge_group(self, group):
+        """Composite layers with the same distance into a single cached layer, or None if they can't share one"""
+        tile_mode = group[0].tile_mode
+        if any(layer.tile_mode != tile_mode for layer in group):
+            return None
+
+        top = min(layer.y_offset for layer in group)
+        bottom = max(layer.y_offset + layer.height for layer in group)
+
+        if tile_mode == TileMode.NONE:
+            left = min(layer.x_offset for layer in group)
+            right = max(layer.x_offset + layer.width for layer in group)
+            strip = pygame.Surface((right - left, bottom - top), pygame.SRCALPHA)
+            for layer in group:
+                strip.blit(layer.image, (layer.x_offset - left, layer.y_offset - top))
+            return BackgroundLayer.from_surface(strip, group[0].distance, tile_mode, left, top)
+
+        if tile_mode == TileMode.HORIZONTAL:
+            # The strip has to repeat every layer exactly, so its width is the common period
+            period = 1
+            for layer in group:
+                period = period * layer.width // math.gcd(period, layer.width)
+            if period > MAX_STRIP_WIDTH:
+                return None
+            strip = pygame.Surface((period, bottom - top), pygame.SRCALPHA)
+            for layer in group:
+                phase = layer.x_offset % layer.width
+                for i in range(-1, period // layer.width + 1):
+                    strip.blit(layer.image, (phase + i * layer.width, layer.y_offset - top))
+            return BackgroundLayer.from_surface(strip, group[0].distance, tile_mode, 0, top)
+
+        return None
+
+    def _build_draw_layers(self):
+        if not self.composite:
+            return list(self.layers)
+
+        # Group neighbouring layers whose distances are within the merge tolerance
+        groups = []
         for layer in self.layers:
-            # Calculate parallax offset based on camera position
-            parallax_x = -(camera.camera.x * (1 - layer.distance)) + layer.x_offset
-            parallax_y = -(camera.camera.y * (1 - layer.distance)) + layer.y_offset
-            
-            if layer.tile_mode in [TileMode.HORIZONTAL, TileMode.BOTH]:
-                start_x = parallax_x % layer.width
-                
-                if layer.tile_mode == TileMode.BOTH:
-                    # Handle both horizontal and vertical tiling
-                    start_y = parallax_y % layer.height
-                    for i in range(layer.num_copies):
-                        for j in range(layer.vertical_copies):
-                            x = start_x + (i * layer.width)
-                            y = start_y + (j * layer.height)
-                            if x > config.WINDOW_WIDTH: break
-                            if y > config.WINDOW_HEIGHT: continue
-                            screen.blit(layer.image, (x, y))
-                else:
-                    # Horizontal only tiling
-                    for i in range(layer.num_copies):
-                        x = start_x + (i * layer.width)
-                        if x > config.WINDOW_WIDTH: break
-                        screen.blit(layer.image, (x, parallax_y))
-            
-            elif layer.tile_mode == TileMode.VERTICAL:
-                # Vertical only tiling
-                start_y = parallax_y % layer.height
-                for j in range(layer.vertical_copies):
-                    y = start_y + (j * layer.height)
-                    if y > config.WINDOW_HEIGHT: break
-                    screen.blit(layer.image, (parallax_x, y))
+            if groups and groups[-1][0].distance - layer.distance <= self.merge_tolerance + 1e-9:
+                groups[-1].append(layer)
             else:
-                # No tiling
-                screen.blit(layer.image, (parallax_x, parallax_y)) 
\ No newline at end of file
+                groups.append([layer])
+
+        draw_layers = []
+        for group in groups:
+            merged = self._merge_group(group) if len(group) > 1 else None
+            draw_layers.extend([merged] if merged else group)
+
+        # Opaque layers don't need per-pixel alpha blending
+        for layer in draw_layers:
+            if is_opaque(layer.image):
+                layer.image = layer.image.convert()
+        return draw_layers
+
+    def _layer_offsets(self, layer, camera):
+        # Calculate parallax offset based on camera position
+        parallax_x = -(camera.camera.x * (1 - layer.distance)) + layer.x_offset
+        parallax_y = -(camera.camera.y * (1 - layer.distance)) + layer.y_offset
+        return parallax_x, parallax_y
+
+    def _draw_layers_to(self, surface, camera):
+        for layer in self._draw_layers:
+            parallax_x, parallax_y = self._layer_offsets(layer, camera)
+            positions = layer.tile_positions(parallax_x, parallax_y)
+            surface.blits([(layer.image, position) for position in positions], doreturn=False)
+
+    def draw(self, screen, camera):
+        """Draw all background layers with parallax effect"""
+        if self._draw_layers is None:
+            self._draw_layers = self._build_draw_layers()
+
+        if not self.cache_frames:
+            self._draw_layers_to(screen, camera)
+            return
+
+        # Blits land on whole pixels, so only redraw once some layer moved a pixel
+        frame_key = tuple(
+            (int(x), int(y)) for x, y in (self._layer_offsets(layer, camera) for layer in self._draw_layers)
+        )
+        if frame_key != self._frame_key:
+            if self._frame_cache is None:
+                self._frame_cache = pygame.Surface(screen.get_size()).convert()
+            self._frame_cache.fill(config.BLACK)
+            self._draw_layers_to(self._frame_cache, camera)
+            self._frame_key = frame_key
+        screen.blit(self._frame_cache, (0, 0))
@@ -8,6 +8,7 @@ class Camera:
         self.height = height
         self.min_y = 0  # Minimum y position (top of level)
         self.max_y = height - config.WINDOW_HEIGHT  # Maximum y position (bottom of level)
+        self.view = pygame.Rect(0, 0, config.WINDOW_WIDTH, config.WINDOW_HEIGHT)  # Visible world area
 
     def apply(self, entity):
         if isinstance(entity, pygame.Rect):
@@ -20,6 +21,11 @@ class Camera:
                          entity.rect.width,
                          entity.rect.height)
 
+    def apply_into(self, rect, out):
+        """Like apply, but writes the screen-space rect into an existing Rect"""
+        out.update(rect.x - self.camera.x, rect.y - self.camera.y, rect.width, rect.height)
+        return out
+
     def update(self, target):
         # Calculate x position (horizontal scrolling remains the same)
         x = -target.rect.centerx + config.WINDOW_WIDTH // 2
@@ -32,4 +38,5 @@ class Camera:
         y = max(-(self.max_y), y)  # Don't show below bottom of level
         
         self.camera.x = -x
-        self.camera.y = -y
\ No newline at end of file
+        self.camera.y = -y
+        self.view.topleft = self.camera.topleft
\ No newline at end of file
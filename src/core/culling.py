@@ -0,0 +1,89 @@
+import pygame
+
+class ViewCuller:
+    def __init__(self, camera, spatial_hash=None, margin=0):
+        """
+        Culling stage on top of Camera that draws only what is on screen
+
+        Args:
+            camera: Camera whose view rect defines the visible area
+            spatial_hash: SpatialHash indexing the world rects of drawable objects
+            margin: Extra pixels around the view that still count as visible
+        """
+        self.camera = camera
+        self.spatial_hash = spatial_hash
+        self.margin = margin
+
+        # Candidate list cached until the view changes cells or the index changes
+        self._cache_key = None
+        self._candidates = []
+
+        # Reused per-frame buffers
+        self._dest_rects = []
+        self._visible = []
+        self._solid_surfaces = {}
+
+    def set_spatial_hash(self, spatial_hash):
+        """Point the culler at a new index (e.g. after a level reset)"""
+        self.spatial_hash = spatial_hash
+        self._cache_key = None
+
+    def _view_rect(self):
+        if self.margin:
+            return self.camera.view.inflate(self.margin * 2, self.margin * 2)
+        return self.camera.view
+
+    def _get_candidates(self, view):
+        key = (id(self.spatial_hash), self.spatial_hash.version, self.spatial_hash.cell_range(view))
+        if key != self._cache_key:
+            # Static geometry is drawn from baked chunks, so leave it out
+            candidates = [obj for obj in self.spatial_hash.query(view) if not obj.is_static]
+            candidates.sort(key=lambda obj: obj.draw_layer)
+            self._candidates = candidates
+            self._cache_key = key
+        return self._candidates
+
+    def visible(self):
+        """Return the objects whose rects overlap the camera view, in draw order"""
+        view = self._view_rect()
+        visible = self._visible
+        visible.clear()
+        if self.spatial_hash is None:
+            return visible
+        for obj in self._get_candidates(view):
+            if obj.rect.colliderect(view):
+                visible.append(obj)
+        return visible
+
+    def _solid_surface(self, width, height, color):
+        key = (width, height, color)
+        surface = self._solid_surfaces.get(key)
+        if surface is None:
+            surface = pygame.Surface((width, height))
+            surface.fill(color)
+            self._solid_surfaces[key] = surface
+        return surface
+
+    def draw(self, screen):
+        """Draw every visible object as a solid rect in one batched blit call"""
+        visible = self.visible()
+
+        # Grow the reusable rect buffer to fit this frame's visible set
+        dest_rects = self._dest_rects
+        while len(dest_rects) < len(visible):
+            dest_rects.append(pygame.Rect(0, 0, 0, 0))
+
+        batch = []
+        camera_x, camera_y = self.camera.camera.x, self.camera.camera.y
+        for obj, dest in zip(visible, dest_rects):
+            # Animations are applied here, leaving the object's own rect untouched
+            obj.render_rect(dest)
+            if dest.width <= 0 or dest.height <= 0:
+                continue
+            dest.move_ip(-camera_x, -camera_y)
+            batch.append((self._solid_surface(dest.width, dest.height, obj.color), dest))
+
+        if hasattr(screen, 'fblits'):
+            screen.fblits(batch)
+        else:
+            screen.blits(batch, doreturn=False)
@@ -3,17 +3,31 @@ from physics.constants import *
 from .audio import AudioManager
 
 class GameObject:
-    def __init__(self, physics_world, x, y, width, height):
+    draw_layer = 0  # Lower layers are drawn first
+    is_static = False  # Static objects are baked and skipped by the view culler
+    collision_category = None  # Collision layer from config.json, None collides with everything
+
+    def __init__(self, physics_world, x, y, width, height, kinematic=False):
         self.width = width
         self.height = height
         self.original_y = y
         self.audio_manager = AudioManager.get_instance()
         self.body = None
+        self.physics_world = physics_world
+        self.previous_position = None  # Body position before the last physics step
+        self.ground_contacts = 0  # Contacts this body is standing on, kept by the contact listener
+        self.ground_object = None  # Object most recently stood on
         self.components = {}
+        self.updated_components = []  # Components updated every frame
+        self.render_transforms = []  # Components applied only to the drawn rect
+        self.spatial_hash = None
         
         # Create Box2D body
         if(physics_world):
-            self.body = physics_world.create_dynamic_body(x, y, width, height)
+            if kinematic:
+                self.body = physics_world.create_kinematic_body(x, y, width, height, category=self.collision_category)
+            else:
+                self.body = physics_world.create_dynamic_body(x, y, width, height, category=self.collision_category)
             self.body.userData = self  # Link the physics body back to this object
         
         # Create pygame rect for rendering
@@ -23,15 +37,99 @@ class GameObject:
         # Update pygame rect position from physics body
         if(self.body):
             pos = self.body.position
+            if self.previous_position is not None:
+                # Interpolate between the previous and current physics states
+                alpha = self.physics_world.alpha
+                prev_x, prev_y = self.previous_position
+                pos = (prev_x + (pos.x - prev_x) * alpha, prev_y + (pos.y - prev_y) * alpha)
             self.rect.center = to_pygame_coordinates(pos)
         
         # Update components
-        for component in self.components.values():
+        for component in self.updated_components:
             component.update()
+
+        # Keep spatial index in sync with the moved rect
+        if self.spatial_hash is not None:
+            self.spatial_hash.update(self)
     
+    def capture_state(self):
+        """Return the state needed to put this object back as it is now"""
+        state = {'spatial_hash': self.spatial_hash}
+        if self.body:
+            body = self.body
+            state['body'] = (
+                tuple(body.position),
+                body.angle,
+                tuple(body.linearVelocity),
+                body.angularVelocity,
+                body.active,
+            )
+        return state
+
+    def restore_state(self, state):
+        """Put this object back into a state returned by capture_state, reusing its body"""
+        if 'body' in state:
+            position, angle, linear_velocity, angular_velocity, active = state['body']
+            body = self.body
+            body.active = active
+            body.position = position
+            body.angle = angle
+            body.linearVelocity = linear_velocity
+            body.angularVelocity = angular_velocity
+            body.awake = True
+            self.previous_position = None
+            self.rect.center = to_pygame_coordinates(position)
+
+        spatial_hash = state['spatial_hash']
+        if spatial_hash is not None and self.spatial_hash is None:
+            self.register(spatial_hash)
+        elif self.spatial_hash is not None:
+            self.spatial_hash.update(self)
+
+    def on_contact_begin(self, other):
+        """Called after a physics step when this object's body starts touching another"""
+        pass
+
+    def on_contact_end(self, other):
+        """Called after a physics step when this object's body stops touching another"""
+        pass
+
+    def register(self, spatial_hash):
+        """Add this object to a spatial hash so it is re-indexed whenever it moves"""
+        self.spatial_hash = spatial_hash
+        spatial_hash.insert(self)
+
+    def unregister(self):
+        """Remove this object from its spatial hash"""
+        if self.spatial_hash is not None:
+            self.spatial_hash.remove(self)
+            self.spatial_hash = None
+
+    def destroy(self):
+        """Remove this object from the game for good, destroying its Box2D body"""
+        self.unregister()
+        for component in self.components.values():
+            release = getattr(component, 'release', None)
+            if release:
+                release()
+        if self.body is not None:
+            self.physics_world.destroy_body(self.body)
+            self.body = None
+
+    def render_rect(self, out):
+        """Write the world-space rect this object is drawn at into `out`"""
+        out.update(self.rect)
+        for transform in self.render_transforms:
+            transform.apply(out)
+        return out
+
     def add_component(self, component_name: str, component):
         component.game_object = self
         self.components[component_name] = component
+        if getattr(component, 'is_render_transform', False):
+            self.render_transforms.append(component)
+        else:
+            self.updated_components.append(component)
     
     def get_component(self, component_name: str):
         return self.components.get(component_name)
\ No newline at end of file
@@ -0,0 +1,165 @@
+import struct
+import pygame
+
+# Replay log layout: header, then one fixed-size record per frame
+HEADER = struct.Struct('<4sHH')  # magic, version, physics tick rate
+FRAME = struct.Struct('<BdI')  # input flags, frame time in seconds, state checksum
+MAGIC = b'WRIN'
+VERSION = 1
+
+# Input flag bits
+LEFT = 1
+RIGHT = 2
+JUMP = 4
+PAUSE = 8
+RESET = 16
+
+class ReplayDesyncError(Exception):
+    def __init__(self, frame, expected, actual):
+        super().__init__(f"Replay diverged at frame {frame}: expected checksum {expected:08x}, got {actual:08x}")
+        self.frame = frame
+        self.expected = expected
+        self.actual = actual
+
+class InputFrame:
+    __slots__ = ('direction', 'jump', 'pause', 'reset', 'frame_time')
+
+    def __init__(self, direction=0, jump=False, pause=False, reset=False, frame_time=0.0):
+        """
+        Gameplay input for one frame
+
+        Args:
+            direction: -1 for left, 1 for right, 0 for none
+            jump: Jump was pressed this frame
+            pause: Pause was toggled this frame
+            reset: Reset was pressed this frame
+            frame_time: Seconds of real time the frame advances the simulation by
+        """
+        self.direction = direction
+        self.jump = jump
+        self.pause = pause
+        self.reset = reset
+        self.frame_time = frame_time
+
+    def to_flags(self):
+        flags = 0
+        if self.direction < 0:
+            flags |= LEFT
+        elif self.direction > 0:
+            flags |= RIGHT
+        if self.jump:
+            flags |= JUMP
+        if self.pause:
+            flags |= PAUSE
+        if self.reset:
+            flags |= RESET
+        return flags
+
+    @classmethod
+    def from_flags(cls, flags, frame_time):
+        direction = -1 if flags & LEFT else 1 if flags & RIGHT else 0
+        return cls(direction, bool(flags & JUMP), bool(flags & PAUSE), bool(flags & RESET), frame_time)
+
+class KeyboardInput:
+    """
+    Reads gameplay input from pygame keyboard events and key state.
+
+    Input sources share poll(events, frame_time) -> InputFrame, end_frame(checksum)
+    and close(); checksum is a callable so it is only computed when recording or
+    replaying.
+    """
+    def poll(self, events, frame_time):
+        frame = InputFrame(frame_time=frame_time)
+        for event in events:
+            if event.type == pygame.KEYDOWN:
+                if event.key == pygame.K_w:
+                    frame.jump = True
+                elif event.key == pygame.K_p:
+                    frame.pause = True
+                elif event.key == pygame.K_r:
+                    frame.reset = True
+
+        keys = pygame.key.get_pressed()
+        if keys[pygame.K_a]:
+            frame.direction = -1
+        if keys[pygame.K_d]:
+            frame.direction = 1
+        return frame
+
+    def end_frame(self, checksum):
+        pass
+
+    def close(self):
+        pass
+
+class InputRecorder:
+    def __init__(self, source, path, tick_rate):
+        """
+        Passes input through from another source while writing it to a replay log
+
+        Args:
+            source: Input source to record, e.g. KeyboardInput
+            path: Replay log file to write
+            tick_rate: Physics tick rate, stored so replays can check they match
+        """
+        self.source = source
+        self.file = open(path, 'wb')
+        self.file.write(HEADER.pack(MAGIC, VERSION, tick_rate))
+        self._frame = None
+
+    def poll(self, events, frame_time):
+        self._frame = self.source.poll(events, frame_time)
+        return self._frame
+
+    def end_frame(self, checksum):
+        """Write this frame's input together with the state checksum it produced"""
+        self.file.write(FRAME.pack(self._frame.to_flags(), self._frame.frame_time, checksum()))
+        self.source.end_frame(checksum)
+
+    def close(self):
+        self.file.close()
+        self.source.close()
+
+class ReplayInput:
+    def __init__(self, path, tick_rate):
+        """
+        Plays back a replay log and checks each frame's state checksum
+
+        Args:
+            path: Replay log written by InputRecorder
+            tick_rate: Current physics tick rate; must match the recording
+        """
+        with open(path, 'rb') as f:
+            data = f.read()
+        magic, version, recorded_tick_rate = HEADER.unpack_from(data)
+        if magic != MAGIC or version != VERSION:
+            raise ValueError(f"{path} is not a replay log")
+        if recorded_tick_rate != tick_rate:
+            raise ValueError(f"Replay recorded at {recorded_tick_rate} Hz physics, running at {tick_rate} Hz")
+
+        self.frames = [FRAME.unpack(record) for record in _records(data, HEADER.size)]
+        self.index = 0
+
+    @property
+    def finished(self):
+        return self.index >= len(self.frames)
+
+    def poll(self, events, frame_time):
+        # Live input and real frame time are ignored in favour of the recording
+        flags, recorded_frame_time, _ = self.frames[self.index]
+        return InputFrame.from_flags(flags, recorded_frame_time)
+
+    def end_frame(self, checksum):
+        """Compare this frame's state checksum with the recorded one"""
+        expected = self.frames[self.index][2]
+        actual = checksum()
+        if actual != expected:
+            raise ReplayDesyncError(self.index, expected, actual)
+        self.index += 1
+
+    def close(self):
+        pass
+
+def _records(data, offset):
+    for start in range(offset, len(data) - FRAME.size + 1, FRAME.size):
+        yield data[start:start + FRAME.size]
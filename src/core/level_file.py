@@ -0,0 +1,200 @@
+import json
+import os
+import struct
+from .tile_map import TileMap, resolve_path
+
+# Compiled level layout: header, chunk table, then each chunk's records back to back
+HEADER = struct.Struct('<4sHIIiiII')  # magic, version, width, height, player x, player y, chunk width, chunk count
+CHUNK = struct.Struct('<iiIHHH')  # left, right, record offset, platform/enemy/collectible counts
+PLATFORM = struct.Struct('<iiii')  # x, y, width, height
+OBJECT = struct.Struct('<Bii')  # type id, x, y
+MAGIC = b'WRLV'
+VERSION = 1
+
+# Object type names in level files; the position in the list is the compiled type id
+ENEMY_TYPES = ['slime', 'goblin', 'ghost']
+COLLECTIBLE_TYPES = ['coin', 'jump_boost']
+
+class LevelChunk:
+    __slots__ = ('index', 'left', 'right', 'platforms', 'enemies', 'collectibles')
+
+    def __init__(self, index, left, right, platforms=None, enemies=None, collectibles=None):
+        """
+        One horizontal slice of a level
+
+        Args:
+            index: Position of the chunk from the left of the level
+            left: Leftmost x (pixels) covered by the chunk's contents
+            right: Rightmost x (pixels) covered by the chunk's contents
+            platforms: (x, y, width, height) tuples, including platforms shared with
+                neighbouring chunks; a shared platform has a single body
+            enemies: (type name, x, y) tuples
+            collectibles: (type name, x, y) tuples
+        """
+        self.index = index
+        self.left = left
+        self.right = right
+        self.platforms = platforms if platforms is not None else []
+        self.enemies = enemies if enemies is not None else []
+        self.collectibles = collectibles if collectibles is not None else []
+
+class LevelData:
+    def __init__(self, width, height, player_spawn, chunk_width, chunks):
+        """
+        A level divided into horizontal chunks of platforms, enemies and collectibles
+
+        Args:
+            width: Level width in pixels
+            height: Level height in pixels
+            player_spawn: (x, y) the player starts at
+            chunk_width: Width of a chunk in pixels; objects belong to the chunk their left edge is in
+            chunks: LevelChunk list, or None when chunks are decoded from `_data` on demand
+        """
+        self.width = width
+        self.height = height
+        self.player_spawn = player_spawn
+        self.chunk_width = chunk_width
+        self._chunks = chunks
+        self._data = None
+        self._table = None
+        if chunks is not None:
+            self._set_bounds([(chunk.left, chunk.right) for chunk in chunks])
+
+    def _set_bounds(self, bounds):
+        self.bounds = bounds
+        # How far any chunk's contents stick out past its nominal right edge
+        self.max_overhang = max(
+            [right - (index + 1) * self.chunk_width for index, (left, right) in enumerate(bounds)] + [0]
+        )
+
+    def __len__(self):
+        return len(self.bounds)
+
+    def chunk(self, index):
+        """Return a chunk's contents, decoding it from the compiled data on first use"""
+        if self._chunks[index] is None:
+            left, right, offset, platform_count, enemy_count, collectible_count = self._table[index]
+            data = self._data
+            platforms = [PLATFORM.unpack_from(data, offset + i * PLATFORM.size) for i in range(platform_count)]
+            offset += platform_count * PLATFORM.size
+            enemies = [OBJECT.unpack_from(data, offset + i * OBJECT.size) for i in range(enemy_count)]
+            offset += enemy_count * OBJECT.size
+            collectibles = [OBJECT.unpack_from(data, offset + i * OBJECT.size) for i in range(collectible_count)]
+            self._chunks[index] = LevelChunk(
+                index, left, right, platforms,
+                [(ENEMY_TYPES[kind], x, y) for kind, x, y in enemies],
+                [(COLLECTIBLE_TYPES[kind], x, y) for kind, x, y in collectibles],
+            )
+        return self._chunks[index]
+
+    def chunks_between(self, left, right):
+        """Return the indices of chunks whose contents overlap the x range [left, right]"""
+        width = self.chunk_width
+        first = max(0, int((left - self.max_overhang) // width))
+        last = min(len(self.bounds) - 1, int(right // width))
+        return [index for index in range(first, last + 1)
+                if self.bounds[index][1] >= left and self.bounds[index][0] <= right]
+
+    @classmethod
+    def load(cls, path):
+        """Load a compiled level, or compile a .json level in memory"""
+        if path.endswith('.json'):
+            return cls.from_json(path)
+        with open(resolve_path(path), 'rb') as f:
+            data = f.read()
+
+        magic, version, width, height, spawn_x, spawn_y, chunk_width, chunk_count = HEADER.unpack_from(data)
+        if magic != MAGIC or version != VERSION:
+            raise ValueError(f"{path} is not a compiled level")
+
+        level = cls(width, height, (spawn_x, spawn_y), chunk_width, None)
+        level._data = data
+        level._table = [CHUNK.unpack_from(data, HEADER.size + i * CHUNK.size) for i in range(chunk_count)]
+        level._chunks = [None] * chunk_count
+        level._set_bounds([(entry[0], entry[1]) for entry in level._table])
+        return level
+
+    @classmethod
+    def from_json(cls, path):
+        """
+        Build a level from its JSON authoring format:
+
+            {
+                "width": 2400, "height": 1200, "chunk_width": 600,
+                "player": [100, 300],
+                "terrain": "assets/levels/level1.txt",
+                "platforms": [[x, y, width, height], ...],
+                "enemies": [["slime", x, y], ...],
+                "collectibles": [["coin", x, y], ...]
+            }
+
+        "terrain" is an optional tile map whose merged solid rectangles are added
+        to "platforms". Platforms crossing a chunk boundary are listed in every
+        chunk they overlap.
+        """
+        with open(resolve_path(path), 'r') as f:
+            source = json.load(f)
+
+        platforms = [tuple(platform) for platform in source.get('platforms', [])]
+        if source.get('terrain'):
+            platforms += TileMap.load(source['terrain']).solid_rects()
+        enemies = [tuple(enemy) for enemy in source.get('enemies', [])]
+        collectibles = [tuple(item) for item in source.get('collectibles', [])]
+        for kind, x, y in enemies:
+            if kind not in ENEMY_TYPES:
+                raise ValueError(f"{path}: unknown enemy type {kind!r}")
+        for kind, x, y in collectibles:
+            if kind not in COLLECTIBLE_TYPES:
+                raise ValueError(f"{path}: unknown collectible type {kind!r}")
+
+        width, chunk_width = source['width'], source.get('chunk_width', 600)
+        count = max(1, -(-width // chunk_width))
+        chunks = [LevelChunk(i, i * chunk_width, (i + 1) * chunk_width) for i in range(count)]
+
+        def chunk_at(x):
+            return chunks[max(0, min(count - 1, int(x // chunk_width)))]
+
+        # A platform stays whole (so merged terrain has no seams) and is listed in
+        # every chunk it overlaps. Each chunk's bounds only cover its own part of
+        # it, so a long strip doesn't stretch one chunk over the whole level.
+        for platform in platforms:
+            x, right = platform[0], platform[0] + platform[2]
+            first, last = chunk_at(x).index, chunk_at(max(x, right - 1)).index
+            for chunk in chunks[first:last + 1]:
+                chunk.platforms.append(platform)
+            chunks[first].left = min(chunks[first].left, x)
+            chunks[last].right = max(chunks[last].right, right)
+        for enemy in enemies:
+            chunk_at(enemy[1]).enemies.append(enemy)
+        for item in collectibles:
+            chunk_at(item[1]).collectibles.append(item)
+
+        return cls(width, source['height'], tuple(source['player']), chunk_width, chunks)
+
+    def save(self, path):
+        """Write the compiled binary form of this level"""
+        chunks = [self.chunk(index) for index in range(len(self))]
+        table, records = [], []
+        offset = HEADER.size + CHUNK.size * len(chunks)
+        for chunk in chunks:
+            start = offset
+            for platform in chunk.platforms:
+                records.append(PLATFORM.pack(*(int(value) for value in platform)))
+                offset += PLATFORM.size
+            for kind, x, y in chunk.enemies:
+                records.append(OBJECT.pack(ENEMY_TYPES.index(kind), int(x), int(y)))
+                offset += OBJECT.size
+            for kind, x, y in chunk.collectibles:
+                records.append(OBJECT.pack(COLLECTIBLE_TYPES.index(kind), int(x), int(y)))
+                offset += OBJECT.size
+            table.append(CHUNK.pack(chunk.left, chunk.right, start,
+                                    len(chunk.platforms), len(chunk.enemies), len(chunk.collectibles)))
+
+        path = resolve_path(path)
+        temp_path = path + '.tmp'
+        with open(temp_path, 'wb') as f:
+            f.write(HEADER.pack(MAGIC, VERSION, self.width, self.height,
+                                int(self.player_spawn[0]), int(self.player_spawn[1]), self.chunk_width, len(chunks)))
+            f.write(b''.join(table))
+            f.write(b''.join(records))
+        os.replace(temp_path, path)
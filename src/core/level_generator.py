@@ -0,0 +1,207 @@
+import queue
+import random
+import threading
+from config import config
+from physics.constants import *
+from physics.navigation import jump_air_time
+from .level_file import LevelChunk
+
+# Generated geometry sits on this grid, in pixels
+GRID = 20
+# Fraction of the theoretical jump reach generated gaps may use, leaving room for imperfect jumps
+REACH_SAFETY = 0.75
+# Vertical space kept free above the highest platform (pixels)
+TOP_MARGIN = 200
+# Enemies and items are placed this far above the surface they belong to (pixels)
+ENEMY_DROP_HEIGHT = 60
+ITEM_HEIGHT = 40
+
+class ChunkGenerator:
+    def __init__(self, seed, chunk_width=None, level_height=None, gravity=9.81, jump_speed=None, run_speed=None):
+        """
+        Produces platform, enemy and collectible chunks from a seed
+
+        Every gap and step between consecutive platforms is checked against the
+        player's jump reach, so a generated level can always be crossed without
+        power-ups. Only plain data is produced, so it is safe to run on any thread.
+
+        Args:
+            seed: Same seed, same level
+            chunk_width: Width of a chunk in pixels
+            level_height: Height of the level in pixels
+            gravity: Downward acceleration in meters/second²
+            jump_speed: Player's takeoff speed in meters/second, defaults to the jump force
+            run_speed: Player's horizontal speed in meters/second
+        """
+        self.seed = seed
+        self.chunk_width = chunk_width or config.GENERATOR_CHUNK_WIDTH
+        self.level_height = level_height or config.LEVEL_HEIGHT
+        self.ground_y = self.level_height - 40
+
+        # Jump physics in pixels and seconds, like the navigation graph
+        self._gravity = meters_to_pixels(gravity)
+        self._jump_speed = meters_to_pixels(jump_speed if jump_speed is not None else pixels_to_meters(config.JUMP_FORCE))
+        self._run_speed = meters_to_pixels(run_speed if run_speed is not None else config.PLAYER_SPEED)
+        self.max_rise = self._jump_speed ** 2 / (2 * self._gravity) * REACH_SAFETY
+
+    def jump_reach(self, rise):
+        """Widest gap (pixels) that can safely be jumped while landing `rise` pixels higher"""
+        air_time = jump_air_time(rise, self._gravity, self._jump_speed)
+        if air_time is None:
+            return 0
+        return self._run_speed * air_time * REACH_SAFETY
+
+    def start_state(self):
+        """Where chunk 0 continues from: the right edge and top of a platform under the spawn point"""
+        return (0, self.ground_y)
+
+    def generate(self, index, state):
+        """
+        Generate one chunk
+
+        Args:
+            index: Chunk index; together with the seed it picks the chunk's random choices
+            state: (x, y) of the previous platform's right edge and top, from start_state()
+                or the previous chunk
+
+        Returns:
+            (LevelChunk, state to generate the next chunk from)
+        """
+        rng = random.Random(f"{self.seed}:{index}")
+        left, end = index * self.chunk_width, (index + 1) * self.chunk_width
+        chunk = LevelChunk(index, left, end)
+        x, y = state
+
+        if index == 0:
+            # Solid ground under the spawn point
+            chunk.platforms.append((0, self.ground_y, 400, 40))
+            x, y = 400, self.ground_y
+
+        while x < end:
+            # Step up or down, then pick a gap the player can clear for that step
+            rise = rng.randrange(-8, int(self.max_rise // GRID) + 1) * GRID
+            top = min(self.ground_y, max(TOP_MARGIN, y - rise))
+            rise = y - top
+            max_gap = int(self.jump_reach(rise) // GRID) * GRID
+            gap = rng.randrange(GRID * 2, max(GRID * 2, max_gap) + 1, GRID) if max_gap >= GRID * 2 else 0
+            width = rng.randrange(4, 16) * GRID
+            height = 40 if top == self.ground_y else 20
+
+            platform = (x + gap, top, width, height)
+            chunk.platforms.append(platform)
+            chunk.right = max(chunk.right, platform[0] + width)
+            self._populate(rng, chunk, platform)
+            x, y = platform[0] + width, top
+
+        return chunk, (x, y)
+
+    def _populate(self, rng, chunk, platform):
+        x, top, width, _ = platform
+        roll = rng.random()
+        if width >= 160 and roll < 0.3:
+            kind = rng.choice(['slime', 'goblin', 'ghost'])
+            chunk.enemies.append((kind, x + width // 2, top - ENEMY_DROP_HEIGHT))
+        elif roll < 0.7:
+            chunk.collectibles.append(('coin', x + width // 2, top - ITEM_HEIGHT))
+        elif roll < 0.75:
+            chunk.collectibles.append(('jump_boost', x + width // 2, top - ITEM_HEIGHT))
+
+class GeneratedLevel:
+    def __init__(self, generator, lookahead=None, max_chunks=None):
+        """
+        Endless level whose chunks are generated on a worker thread ahead of need
+
+        Offers the same interface as LevelData so LevelStreamer can stream it.
+        Finished chunks are handed to the main thread through a queue and only
+        become visible to the streamer once the main thread has taken them in
+        poll(), so generating never holds up a frame.
+
+        Args:
+            generator: ChunkGenerator producing the chunks
+            lookahead: Chunks to keep generated beyond the furthest one asked for
+            max_chunks: Length of the level in chunks
+        """
+        self.generator = generator
+        self.chunk_width = generator.chunk_width
+        self.height = generator.level_height
+        self.max_chunks = max_chunks or config.GENERATOR_MAX_CHUNKS
+        self.width = self.chunk_width * self.max_chunks
+        self.player_spawn = (100, generator.ground_y - 100)
+        self.lookahead = lookahead if lookahead is not None else config.GENERATOR_LOOKAHEAD
+        self.blocking = False  # Wait for chunks instead of skipping ones not generated yet
+
+        self.chunks = []
+        self.bounds = []
+        self.max_overhang = 0
+        self._ready = queue.Queue()
+        self._wanted = 0  # Highest chunk index the worker should have generated
+        self._condition = threading.Condition()
+        self._stopped = False
+        self._thread = threading.Thread(target=self._run, name='level-generator', daemon=True)
+        self._request(self.lookahead)
+        self._thread.start()
+        self.poll(wait_for=0)  # The spawn chunk has to exist before the first frame
+
+    def _request(self, index):
+        with self._condition:
+            wanted = min(self.max_chunks - 1, index)
+            if wanted > self._wanted:
+                self._wanted = wanted
+                self._condition.notify()
+
+    def _run(self):
+        """Worker thread: generate chunks in order, up to the furthest one requested"""
+        state = self.generator.start_state()
+        index = 0
+        while True:
+            with self._condition:
+                while not self._stopped and index > self._wanted:
+                    self._condition.wait()
+                if self._stopped:
+                    return
+            chunk, state = self.generator.generate(index, state)
+            self._ready.put(chunk)
+            index += 1
+
+    def stop(self):
+        """Stop the worker thread and wait for it to exit; call when the level is discarded"""
+        with self._condition:
+            self._stopped = True
+            self._condition.notify()
+        self._thread.join()
+
+    def poll(self, wait_for=None):
+        """
+        Take in chunks the worker has finished
+
+        Args:
+            wait_for: Block until the chunk with this index has arrived
+        """
+        while True:
+            if wait_for is not None and len(self.chunks) <= wait_for:
+                chunk = self._ready.get()
+            else:
+                try:
+                    chunk = self._ready.get_nowait()
+                except queue.Empty:
+                    return
+            self.chunks.append(chunk)
+            self.bounds.append((chunk.left, chunk.right))
+            self.max_overhang = max(self.max_overhang, chunk.right - (chunk.index + 1) * self.chunk_width)
+
+    def __len__(self):
+        return len(self.chunks)
+
+    def chunk(self, index):
+        return self.chunks[index]
+
+    def chunks_between(self, left, right):
+        """Return the indices of generated chunks overlapping the x range [left, right]"""
+        last = min(self.max_chunks - 1, int(right // self.chunk_width))
+        self._request(last + self.lookahead)
+        self.poll(wait_for=last if self.blocking else None)
+
+        first = max(0, int((left - self.max_overhang) // self.chunk_width))
+        last = min(len(self.chunks) - 1, last)
+        return [index for index in range(first, last + 1)
+                if self.bounds[index][1] >= left and self.bounds[index][0] <= right]
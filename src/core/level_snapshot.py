@@ -0,0 +1,14 @@
+class LevelSnapshot:
+    def __init__(self, game_objects):
+        """
+        Captures the state of a level's objects once so it can be restored in place
+
+        Args:
+            game_objects: Objects whose bodies, velocities and gameplay state are captured
+        """
+        self.states = [(game_object, game_object.capture_state()) for game_object in game_objects]
+
+    def restore(self):
+        """Put every captured object back into its captured state, reusing its body"""
+        for game_object, state in self.states:
+            game_object.restore_state(state)
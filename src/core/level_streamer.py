@@ -0,0 +1,264 @@
+from config import config
+
+class LoadedChunk:
+    __slots__ = ('platforms', 'collectibles', 'enemies', 'pending', 'spawned')
+
+    def __init__(self, pending):
+        self.platforms = []  # Including platforms shared with neighbouring chunks
+        self.collectibles = []
+        self.enemies = []  # Enemies currently over this chunk, wherever they spawned
+        self.pending = pending  # Iterator over objects still to create, None once complete
+        self.spawned = 0  # Enemies of this chunk's level data created so far
+
+class LevelStreamer:
+    def __init__(self, level, physics_world, chunk_objects, spatial_hash, geometry_baker,
+                 load_margin=config.STREAM_LOAD_MARGIN, unload_margin=config.STREAM_UNLOAD_MARGIN,
+                 batch_size=config.STREAM_BATCH_SIZE):
+        """
+        Keeps only the level chunks around the camera instantiated
+
+        Args:
+            level: LevelData (or GeneratedLevel) to stream
+            physics_world: World the chunks' bodies are created in and destroyed from
+            chunk_objects: Called as chunk_objects(physics_world, chunk, shared_platform);
+                yields ('platform' | 'collectible' | 'enemy', game object) pairs,
+                creating each object only when it is asked for. shared_platform is
+                called with each platform tuple before its body is created and
+                returns True if the platform already exists and must be skipped.
+            spatial_hash: Index loaded objects are registered in
+            geometry_baker: Baker loaded platforms are added to
+            load_margin: Pixels beyond each side of the view within which chunks are loaded
+            unload_margin: Pixels beyond each side of the view past which chunks are unloaded.
+                Larger than load_margin so chunks on the boundary don't flicker.
+            batch_size: Most objects (and Box2D bodies) created per update, so loading
+                a chunk is spread over several frames. None creates whole chunks at once.
+        """
+        self.level = level
+        self.physics_world = physics_world
+        self.chunk_objects = chunk_objects
+        self.spatial_hash = spatial_hash
+        self.geometry_baker = geometry_baker
+        self.load_margin = load_margin
+        self.unload_margin = max(unload_margin, load_margin)
+        self.batch_size = batch_size
+
+        # Objects of every loaded chunk; updated in place so callers can hold on to the lists
+        self.platforms = []
+        self.collectibles = []
+        self.enemies = []
+        self.loaded = {}  # Chunk index -> LoadedChunk, including chunks still being created
+        self.collected = set()  # (chunk index, item index) of items picked up, kept across unloads
+        self.origins = {}  # Enemy -> (chunk index, enemy index) it was spawned from
+        self.away = set()  # Origins of enemies alive in another chunk, not to be spawned again
+        self.initial_states = {}  # Loaded collectible or enemy -> state captured when it was created
+        # Platforms can span several chunks: the body lives while any of them is loaded
+        self.platform_objects = {}  # Platform tuple -> Platform
+        self.platform_users = {}  # Platform -> (platform tuple, indices of loaded chunks using it)
+        self._creating = None  # Platform tuple whose body chunk_objects is about to create
+
+        # Objects created and destroyed since the last take_changes()
+        self.added_platforms = []
+        self.removed_platforms = []
+        self.added_enemies = []
+        self.removed_enemies = []
+
+    def update(self, view):
+        """
+        Load chunks coming into range of the view and unload those left behind
+
+        Returns:
+            True if a chunk finished loading or was unloaded
+        """
+        changed = False
+        self._rehome_enemies()
+        keep_left, keep_right = view.left - self.unload_margin, view.right + self.unload_margin
+        for index in list(self.loaded):
+            left, right = self.level.bounds[index]
+            if right < keep_left or left > keep_right:
+                self.unload(index)
+                changed = True
+
+        for index in self.level.chunks_between(view.left - self.load_margin, view.right + self.load_margin):
+            if index not in self.loaded:
+                self._start_loading(index)
+
+        # Create objects for chunks still loading, nearest to the view first
+        center = view.centerx
+        loading = sorted((index for index, chunk in self.loaded.items() if chunk.pending is not None),
+                         key=lambda index: abs(sum(self.level.bounds[index]) / 2 - center))
+        budget = self.batch_size
+        for index in loading:
+            created = self._create(index, budget)
+            if self.loaded[index].pending is None:
+                changed = True
+            if budget is not None:
+                budget -= created
+                if budget <= 0:
+                    break
+        return changed
+
+    def _rehome_enemies(self):
+        """
+        Hand enemies that moved over another loaded chunk to that chunk, so they
+        are unloaded with the ground under them rather than with their spawn chunk
+        """
+        for index, chunk in self.loaded.items():
+            for enemy in list(chunk.enemies):
+                under = self.level.chunks_between(enemy.rect.centerx, enemy.rect.centerx)
+                if not under or index in under:
+                    continue
+                target = next((other for other in under if other in self.loaded), None)
+                if target is None:
+                    continue  # Nothing loaded there yet; stays with the chunk it was on
+                chunk.enemies.remove(enemy)
+                self.loaded[target].enemies.append(enemy)
+                origin = self.origins[enemy]
+                if origin[0] == target:
+                    self.away.discard(origin)
+                else:
+                    self.away.add(origin)
+
+    def _start_loading(self, index):
+        def shared_platform(platform):
+            return self._shared_platform(index, platform)
+        objects = self.chunk_objects(self.physics_world, self.level.chunk(index), shared_platform)
+        self.loaded[index] = LoadedChunk(iter(objects))
+
+    def _shared_platform(self, index, platform):
+        """Let chunk `index` use an existing platform body instead of creating another one"""
+        existing = self.platform_objects.get(platform)
+        if existing is None:
+            self._creating = platform
+            return False
+        self.platform_users[existing][1].add(index)
+        self.loaded[index].platforms.append(existing)
+        return True
+
+    def _create(self, index, limit):
+        """Create up to `limit` (all if None) of a chunk's remaining objects and return how many were made"""
+        chunk = self.loaded[index]
+        created = 0
+        while limit is None or created < limit:
+            entry = next(chunk.pending, None)
+            if entry is None:
+                chunk.pending = None
+                break
+            kind, game_object = entry
+            game_object.register(self.spatial_hash)
+            if kind != 'platform':
+                self.initial_states[game_object] = game_object.capture_state()
+            if kind == 'platform':
+                self.platform_objects[self._creating] = game_object
+                self.platform_users[game_object] = (self._creating, {index})
+                self.geometry_baker.add_platform(game_object)
+                chunk.platforms.append(game_object)
+                self.platforms.append(game_object)
+                self.added_platforms.append(game_object)
+            elif kind == 'collectible':
+                if (index, len(chunk.collectibles)) in self.collected:
+                    game_object.mark_collected()
+                chunk.collectibles.append(game_object)
+                self.collectibles.append(game_object)
+            else:
+                origin = (index, chunk.spawned)
+                chunk.spawned += 1
+                if origin in self.away:
+                    # Still alive in another chunk it wandered into
+                    del self.initial_states[game_object]
+                    game_object.destroy()
+                    continue
+                self.origins[game_object] = origin
+                chunk.enemies.append(game_object)
+                self.enemies.append(game_object)
+                self.added_enemies.append(game_object)
+            created += 1
+        return created
+
+    def load(self, index):
+        """Instantiate all of a chunk's objects and their bodies right away"""
+        if index not in self.loaded:
+            self._start_loading(index)
+        if self.loaded[index].pending is not None:
+            self._create(index, None)
+
+    def load_at(self, x):
+        """Instantiate the chunks containing x right away, e.g. around the spawn point"""
+        for index in self.level.chunks_between(x, x):
+            self.load(index)
+
+    def unload(self, index):
+        """Destroy a chunk's objects and bodies, remembering which items were collected"""
+        chunk = self.loaded.pop(index)
+        for item_index, collectible in enumerate(chunk.collectibles):
+            if collectible.collected:
+                self.collected.add((index, item_index))
+        released = []
+        for platform in chunk.platforms:
+            key, users = self.platform_users[platform]
+            users.discard(index)
+            if not users:
+                # No other loaded chunk stands on it
+                del self.platform_users[platform]
+                del self.platform_objects[key]
+                self.geometry_baker.remove_platform(platform)
+                released.append(platform)
+
+        for enemy in chunk.enemies:
+            # Spawns again when its own chunk is next loaded
+            self.away.discard(self.origins.pop(enemy))
+
+        removed = set(released + chunk.collectibles + chunk.enemies)
+        self._remove(removed)
+
+    def _remove(self, removed):
+        """Destroy objects and drop them from the streamer's lists"""
+        for game_object in removed:
+            self.initial_states.pop(game_object, None)
+            game_object.destroy()
+        self.removed_platforms += [game_object for game_object in self.platforms if game_object in removed]
+        self.removed_enemies += [game_object for game_object in self.enemies if game_object in removed]
+        self.platforms[:] = [game_object for game_object in self.platforms if game_object not in removed]
+        self.collectibles[:] = [game_object for game_object in self.collectibles if game_object not in removed]
+        self.enemies[:] = [game_object for game_object in self.enemies if game_object not in removed]
+
+    def take_changes(self):
+        """
+        Return the objects created and destroyed since the last call, so whatever
+        indexes them can be updated incrementally. Apply additions before removals:
+        an object can be created and destroyed between two calls.
+
+        Returns:
+            (added platforms, removed platforms, added enemies, removed enemies)
+        """
+        changes = (self.added_platforms, self.removed_platforms, self.added_enemies, self.removed_enemies)
+        self.added_platforms, self.removed_platforms, self.added_enemies, self.removed_enemies = [], [], [], []
+        return changes
+
+    def reset(self):
+        """
+        Put the loaded chunks back as they were created and forget collected items,
+        for a fresh start. Bodies are reused; chunks that end up out of range of the
+        camera are unloaded by the next update as usual.
+        """
+        self.collected.clear()
+
+        # Enemies go back to their spawn point, so back into the chunk they spawned from
+        gone = set()
+        for index, chunk in self.loaded.items():
+            for enemy in list(chunk.enemies):
+                home = self.origins[enemy][0]
+                if home == index:
+                    continue
+                chunk.enemies.remove(enemy)
+                if home in self.loaded:
+                    self.loaded[home].enemies.append(enemy)
+                else:
+                    # Spawns again when its own chunk is next loaded
+                    del self.origins[enemy]
+                    gone.add(enemy)
+        self.away.clear()
+        if gone:
+            self._remove(gone)
+
+        for game_object, state in self.initial_states.items():
+            game_object.restore_state(state)
@@ -0,0 +1,147 @@
+import csv
+import json
+import time
+from collections import deque
+from config import config
+
+class _NullScope:
+    """Scope returned while profiling is disabled; does nothing"""
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        return False
+
+_NULL_SCOPE = _NullScope()
+
+class _Scope:
+    def __init__(self, profiler, name):
+        self.profiler = profiler
+        self.name = name
+        self.starts = []  # One start time per open use, so a scope can nest inside itself
+
+    def __enter__(self):
+        self.starts.append(time.perf_counter())
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        start = self.starts.pop()
+        if not self.starts:
+            # Only the outermost use is counted, so nested time isn't added twice
+            totals = self.profiler.frame_totals
+            totals[self.name] = totals.get(self.name, 0.0) + time.perf_counter() - start
+        return False
+
+class Profiler:
+    def __init__(self, window=240):
+        """
+        Named timing scopes with rolling per-frame statistics
+
+        Args:
+            window: Number of recent frames kept for percentile statistics
+        """
+        self.enabled = False
+        self.window = window
+        self.samples = {}  # Scope name -> deque of per-frame totals in seconds
+        self.counters = {}  # Name -> latest value, e.g. Box2D body count
+        self.frame_totals = {}
+        self.frame = 0
+        self._scopes = {}
+        self._frame_start = None
+
+        self._export_file = None
+        self._export_writer = None
+        self._export_format = None
+
+    def scope(self, name):
+        """Return a context manager timing the enclosed block under `name`"""
+        if not self.enabled:
+            return _NULL_SCOPE
+        scope = self._scopes.get(name)
+        if scope is None:
+            scope = self._scopes[name] = _Scope(self, name)
+        return scope
+
+    def set_enabled(self, enabled):
+        self.enabled = enabled
+        if not enabled:
+            self.frame_totals.clear()
+            self._frame_start = None
+
+    def toggle(self):
+        self.set_enabled(not self.enabled)
+        return self.enabled
+
+    def count(self, name, value):
+        """Record a per-frame counter shown alongside the timings"""
+        if self.enabled:
+            self.counters[name] = value
+
+    def begin_frame(self):
+        if self.enabled:
+            self._frame_start = time.perf_counter()
+
+    def end_frame(self):
+        """Push this frame's scope totals into the rolling windows and export them"""
+        if not self.enabled:
+            return
+        if self._frame_start is not None:
+            self.frame_totals['frame'] = time.perf_counter() - self._frame_start
+            self._frame_start = None
+
+        for name, total in self.frame_totals.items():
+            samples = self.samples.get(name)
+            if samples is None:
+                samples = self.samples[name] = deque(maxlen=self.window)
+            samples.append(total)
+
+        if self._export_file:
+            self._export_frame()
+
+        self.frame_totals.clear()
+        self.frame += 1
+
+    def percentiles(self, name, points=(0.50, 0.95, 0.99)):
+        """Return the requested percentiles of a scope's recent frames, in milliseconds"""
+        samples = self.samples.get(name)
+        if not samples:
+            return tuple(0.0 for _ in points)
+        ordered = sorted(samples)
+        last = len(ordered) - 1
+        return tuple(ordered[min(last, int(p * len(ordered)))] * 1000.0 for p in points)
+
+    def stats(self):
+        """Return {scope name: (p50, p95, p99)} in milliseconds"""
+        return {name: self.percentiles(name) for name in self.samples}
+
+    def start_export(self, path):
+        """Write every profiled frame to a .csv or .jsonl file"""
+        self.stop_export()
+        self._export_format = 'csv' if path.endswith('.csv') else 'jsonl'
+        self._export_file = open(path, 'w', newline='')
+        if self._export_format == 'csv':
+            self._export_writer = csv.writer(self._export_file)
+            self._export_writer.writerow(['frame', 'name', 'ms'])
+
+    def stop_export(self):
+        if self._export_file:
+            self._export_file.close()
+        self._export_file = None
+        self._export_writer = None
+
+    def _export_frame(self):
+        if self._export_format == 'csv':
+            for name, total in self.frame_totals.items():
+                self._export_writer.writerow([self.frame, name, f"{total * 1000.0:.4f}"])
+            for name, value in self.counters.items():
+                self._export_writer.writerow([self.frame, name, value])
+        else:
+            record = {
+                'frame': self.frame,
+                'ms': {name: total * 1000.0 for name, total in self.frame_totals.items()},
+                'counters': dict(self.counters),
+            }
+            self._export_file.write(json.dumps(record) + '\n')
+
+# Create a global instance
+profiler = Profiler(config.PROFILER_WINDOW)
@@ -0,0 +1,91 @@
+class SpatialHash:
+    def __init__(self, cell_size=128):
+        """
+        Uniform grid index over world-space pygame rects
+
+        Args:
+            cell_size: Width and height of a grid cell in pixels
+        """
+        self.cell_size = cell_size
+        self.cells = {}
+        # Cell range each object currently occupies, keyed by object
+        self.object_cells = {}
+        # Bumped whenever cell membership changes so callers can cache queries
+        self.version = 0
+
+    def cell_range(self, rect):
+        """Return the (min_x, min_y, max_x, max_y) cell coordinates covered by rect"""
+        size = self.cell_size
+        return (rect.left // size, rect.top // size,
+                (rect.right - 1) // size, (rect.bottom - 1) // size)
+
+    def _add_to_cells(self, obj, cell_range):
+        min_x, min_y, max_x, max_y = cell_range
+        for cx in range(min_x, max_x + 1):
+            for cy in range(min_y, max_y + 1):
+                self.cells.setdefault((cx, cy), set()).add(obj)
+
+    def _remove_from_cells(self, obj, cell_range):
+        min_x, min_y, max_x, max_y = cell_range
+        for cx in range(min_x, max_x + 1):
+            for cy in range(min_y, max_y + 1):
+                cell = self.cells.get((cx, cy))
+                if cell is None:
+                    continue
+                cell.discard(obj)
+                if not cell:
+                    del self.cells[(cx, cy)]
+
+    def insert(self, obj):
+        """Add an object to the index using its current rect"""
+        if obj in self.object_cells:
+            self.update(obj)
+            return
+        cell_range = self.cell_range(obj.rect)
+        self.object_cells[obj] = cell_range
+        self._add_to_cells(obj, cell_range)
+        self.version += 1
+
+    def remove(self, obj):
+        """Remove an object from the index"""
+        cell_range = self.object_cells.pop(obj, None)
+        if cell_range is not None:
+            self._remove_from_cells(obj, cell_range)
+            self.version += 1
+
+    def update(self, obj):
+        """Re-index an object after its rect moved; a no-op if it stayed in the same cells"""
+        old_range = self.object_cells.get(obj)
+        if old_range is None:
+            return
+        new_range = self.cell_range(obj.rect)
+        if new_range == old_range:
+            return
+        self._remove_from_cells(obj, old_range)
+        self.object_cells[obj] = new_range
+        self._add_to_cells(obj, new_range)
+        self.version += 1
+
+    def query(self, rect, margin=0):
+        """Return the set of objects in cells overlapping rect (inflated by margin pixels)"""
+        if margin:
+            rect = rect.inflate(margin * 2, margin * 2)
+        min_x, min_y, max_x, max_y = self.cell_range(rect)
+        result = set()
+        for cx in range(min_x, max_x + 1):
+            for cy in range(min_y, max_y + 1):
+                cell = self.cells.get((cx, cy))
+                if cell:
+                    result.update(cell)
+        return result
+
+    def clear(self):
+        self.cells.clear()
+        self.object_cells.clear()
+        self.version += 1
+
+    def __len__(self):
+        return len(self.object_cells)
+
+    def __contains__(self, obj):
+        return obj in self.object_cells
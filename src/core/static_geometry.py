@@ -0,0 +1,104 @@
+import pygame
+
+class StaticGeometryBaker:
+    def __init__(self, chunk_size=512):
+        """
+        Renders static platforms once into fixed-size chunk surfaces
+
+        Args:
+            chunk_size: Width and height of a chunk surface in pixels
+        """
+        self.chunk_size = chunk_size
+        self.platforms = []
+        self.chunks = {}  # (cx, cy) -> baked Surface
+        self.chunk_platforms = {}  # (cx, cy) -> platforms overlapping that chunk
+        self.dirty_chunks = set()
+
+    def _chunk_keys(self, rect):
+        size = self.chunk_size
+        for cx in range(rect.left // size, (rect.right - 1) // size + 1):
+            for cy in range(rect.top // size, (rect.bottom - 1) // size + 1):
+                yield (cx, cy)
+
+    def add_platform(self, platform):
+        """Register a platform and mark the chunks it covers for baking"""
+        self.platforms.append(platform)
+        platform.geometry_baker = self
+        for key in self._chunk_keys(platform.rect):
+            self.chunk_platforms.setdefault(key, []).append(platform)
+            self.dirty_chunks.add(key)
+
+    def remove_platform(self, platform):
+        """Forget a platform and mark the chunks it covered for rebaking"""
+        self.platforms.remove(platform)
+        platform.geometry_baker = None
+        for key in self._chunk_keys(platform.rect):
+            members = self.chunk_platforms.get(key)
+            if members and platform in members:
+                members.remove(platform)
+            self.dirty_chunks.add(key)
+
+    def clear(self):
+        for platform in self.platforms:
+            platform.geometry_baker = None
+        self.platforms.clear()
+        self.chunks.clear()
+        self.chunk_platforms.clear()
+        self.dirty_chunks.clear()
+
+    def invalidate(self, platform, old_rect=None):
+        """Re-bin a platform whose rect changed and mark the affected chunks dirty"""
+        if old_rect is not None:
+            for key in self._chunk_keys(old_rect):
+                members = self.chunk_platforms.get(key)
+                if members and platform in members:
+                    members.remove(platform)
+                self.dirty_chunks.add(key)
+        for key in self._chunk_keys(platform.rect):
+            members = self.chunk_platforms.setdefault(key, [])
+            if platform not in members:
+                members.append(platform)
+            self.dirty_chunks.add(key)
+
+    def _bake_chunk(self, key):
+        members = self.chunk_platforms.get(key)
+        if not members:
+            self.chunks.pop(key, None)
+            self.chunk_platforms.pop(key, None)
+            return
+
+        surface = self.chunks.get(key)
+        if surface is None:
+            surface = pygame.Surface((self.chunk_size, self.chunk_size), pygame.SRCALPHA)
+            self.chunks[key] = surface
+        surface.fill((0, 0, 0, 0))
+
+        # Draw each platform relative to the chunk origin
+        origin_x = key[0] * self.chunk_size
+        origin_y = key[1] * self.chunk_size
+        for platform in members:
+            local_rect = platform.rect.move(-origin_x, -origin_y)
+            pygame.draw.rect(surface, platform.color, local_rect)
+
+    def bake(self):
+        """Render every dirty chunk"""
+        for key in self.dirty_chunks:
+            self._bake_chunk(key)
+        self.dirty_chunks.clear()
+
+    def draw(self, screen, camera):
+        """Blit only the chunks overlapping the camera view"""
+        if self.dirty_chunks:
+            self.bake()
+
+        view = camera.view
+        size = self.chunk_size
+        batch = []
+        for cx in range(view.left // size, (view.right - 1) // size + 1):
+            for cy in range(view.top // size, (view.bottom - 1) // size + 1):
+                surface = self.chunks.get((cx, cy))
+                if surface is not None:
+                    batch.append((surface, (cx * size - view.x, cy * size - view.y)))
+
+        if batch:
+            screen.blits(batch, doreturn=False)
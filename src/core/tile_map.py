@@ -0,0 +1,147 @@
+import os
+import re
+
+# Tile characters in level files
+EMPTY = '.'
+SOLID = '#'
+
+# A run of tiles in a level file row: optional repeat count followed by a tile character
+_RUN = re.compile(r'(\d*)([.#])')
+
+def resolve_path(path):
+    """Return path as is if absolute, otherwise relative to the repository root"""
+    if os.path.isabs(path):
+        return path
+    return os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(__file__))), path)
+
+class TileMap:
+    def __init__(self, columns, rows, tile_size, tiles=None):
+        """
+        Grid of solid and empty terrain tiles
+
+        Args:
+            columns: Grid width in tiles
+            rows: Grid height in tiles
+            tile_size: Width and height of one tile in pixels
+            tiles: Row-major bytes, 1 for solid; all empty if not given
+        """
+        self.columns = columns
+        self.rows = rows
+        self.tile_size = tile_size
+        self.tiles = bytearray(tiles) if tiles is not None else bytearray(columns * rows)
+        self._rects = None
+
+    @classmethod
+    def load(cls, path):
+        """
+        Read a level terrain file.
+
+        The file has a `tile_size <pixels>` line, a `size <columns> <rows>` line and
+        then one line per tile row. Rows are run-length encoded: `12.` is twelve
+        empty tiles and `5#` five solid ones, and a character without a count is a
+        single tile, so a plain grid of '.' and '#' also works. Lines starting with
+        '#' before the rows are comments.
+        """
+        with open(resolve_path(path), 'r') as f:
+            lines = [line.strip() for line in f]
+
+        tile_size, columns, rows = None, None, None
+        grid_lines = []
+        for number, line in enumerate(lines, 1):
+            if grid_lines or (tile_size and columns):
+                if line:
+                    grid_lines.append((number, line))
+            elif not line or line.startswith('#'):
+                continue
+            elif line.startswith('tile_size'):
+                tile_size = int(line.split()[1])
+            elif line.startswith('size'):
+                columns, rows = (int(value) for value in line.split()[1:3])
+            else:
+                raise ValueError(f"{path}:{number}: expected 'tile_size' or 'size', got {line!r}")
+
+        if tile_size is None or columns is None:
+            raise ValueError(f"{path}: missing 'tile_size' or 'size' line")
+        if len(grid_lines) != rows:
+            raise ValueError(f"{path}: expected {rows} tile rows, found {len(grid_lines)}")
+
+        tile_map = cls(columns, rows, tile_size)
+        for row, (number, line) in enumerate(grid_lines):
+            column = 0
+            for count, char in _RUN.findall(line):
+                count = int(count) if count else 1
+                if char == SOLID:
+                    start = row * columns + column
+                    tile_map.tiles[start:start + count] = b'\x01' * count
+                column += count
+            if column != columns or _RUN.sub('', line):
+                raise ValueError(f"{path}:{number}: row does not describe exactly {columns} tiles")
+        return tile_map
+
+    @property
+    def width(self):
+        return self.columns * self.tile_size
+
+    @property
+    def height(self):
+        return self.rows * self.tile_size
+
+    def is_solid(self, column, row):
+        if 0 <= column < self.columns and 0 <= row < self.rows:
+            return self.tiles[row * self.columns + column] != 0
+        return False
+
+    def set_solid(self, column, row, solid=True):
+        self.tiles[row * self.columns + column] = 1 if solid else 0
+        self._rects = None
+
+    def merge_tiles(self):
+        """
+        Cover the solid tiles with rectangles using a greedy row-major sweep
+
+        Each still-uncovered solid tile, in row-major order, starts a rectangle that
+        grows right as far as the row allows and then down while every tile below
+        it is solid and uncovered. This usually merges tiles into far fewer
+        rectangles, but is not guaranteed to find the minimal cover.
+
+        Returns:
+            List of (column, row, columns, rows) tile rectangles
+        """
+        columns, rows, tiles = self.columns, self.rows, self.tiles
+        covered = bytearray(len(tiles))
+        rects = []
+        for row in range(rows):
+            row_start = row * columns
+            column = 0
+            while column < columns:
+                index = row_start + column
+                if not tiles[index] or covered[index]:
+                    column += 1
+                    continue
+
+                width = 1
+                while column + width < columns and tiles[index + width] and not covered[index + width]:
+                    width += 1
+
+                height = 1
+                while row + height < rows:
+                    below = index + height * columns
+                    span = tiles[below:below + width]
+                    if span.count(0) or covered[below:below + width].count(1):
+                        break
+                    height += 1
+
+                for r in range(height):
+                    start = index + r * columns
+                    covered[start:start + width] = b'\x01' * width
+                rects.append((column, row, width, height))
+                column += width
+        return rects
+
+    def solid_rects(self):
+        """Return the merged solid areas as (x, y, width, height) pixel rectangles, computed once"""
+        if self._rects is None:
+            size = self.tile_size
+            self._rects = [(column * size, row * size, width * size, height * size)
+                           for column, row, width, height in self.merge_tiles()]
+        return self._rects
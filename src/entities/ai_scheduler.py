@@ -0,0 +1,86 @@
+import time
+from collections import deque
+from config import config
+
+class AIScheduler:
+    def __init__(self, groups=config.AI_GROUPS, near_distance=config.AI_NEAR_DISTANCE,
+                 far_distance=config.AI_FAR_DISTANCE, far_interval=config.AI_FAR_INTERVAL,
+                 budget_ms=config.AI_BUDGET_MS):
+        """
+        Spreads enemy think-ticks over frames and caps the time AI may take per frame
+
+        Enemies are split into round-robin slots by their position in the enemy list.
+        Enemies near the camera think every frame, those further away once every
+        `groups` frames, and the furthest once every far_interval frames, each on
+        its own slot's frame. In between,
+        enemies keep moving at the velocity their last think chose.
+
+        Args:
+            groups: Number of round-robin groups
+            near_distance: Pixels from the view center within which enemies think every frame
+            far_distance: Pixels from the view center beyond which enemies think every far_interval frames
+            far_interval: Frames between think-ticks for far away enemies
+            budget_ms: AI time allowed per frame; enemies left over think first next frame.
+                None removes the budget, which keeps runs deterministic.
+        """
+        self.groups = max(1, groups)
+        self.near_distance_sq = near_distance ** 2
+        self.far_distance_sq = far_distance ** 2
+        self.far_interval = max(self.groups, far_interval)
+        self.budget = budget_ms / 1000.0 if budget_ms is not None else None
+        self.frame = 0
+        self.overdue = deque()  # Enemies whose think-tick was pushed back by the budget
+        self.think_count = 0  # Enemies that thought in the last update
+        self.deferred_count = 0  # Enemies pushed to the next frame in the last update
+
+    def reset(self):
+        """Start the round-robin over, e.g. when the level is reset"""
+        self.frame = 0
+        self.overdue.clear()
+
+    def _interval(self, enemy, center_x, center_y):
+        dx = enemy.rect.centerx - center_x
+        dy = enemy.rect.centery - center_y
+        distance_sq = dx * dx + dy * dy
+        if distance_sq <= self.near_distance_sq:
+            return 1
+        if distance_sq <= self.far_distance_sq:
+            return self.groups
+        return self.far_interval
+
+    def update(self, enemies, player, camera):
+        """Let the enemies whose turn it is think, within the frame's time budget"""
+        frame = self.frame
+        self.frame += 1
+        center_x, center_y = camera.view.center
+
+        # Enemies held back last frame go first so nobody starves
+        due = [enemy for enemy in self.overdue if enemy.simulated]
+        waiting = set(due)
+        self.overdue.clear()
+        for index, enemy in enumerate(enemies):
+            if not enemy.simulated or enemy in waiting:
+                continue
+            interval = self._interval(enemy, center_x, center_y)
+            # Phase by list position modulo the interval, so each band is spread over all its frames
+            if (frame + index % interval) % interval == 0:
+                due.append(enemy)
+                waiting.add(enemy)
+            else:
+                enemy.coast()
+
+        clock = time.perf_counter
+        deadline = clock() + self.budget if self.budget is not None else None
+        think_count = 0
+        for position, enemy in enumerate(due):
+            # Always let at least one enemy think so progress is made under any budget
+            if think_count and deadline is not None and clock() > deadline:
+                for deferred in due[position:]:
+                    deferred.coast()
+                self.overdue.extend(due[position:])
+                break
+            enemy.think(player)
+            think_count += 1
+
+        self.think_count = think_count
+        self.deferred_count = len(self.overdue)
@@ -2,23 +2,53 @@ from abc import ABC, abstractmethod
 
 import pygame
 from core.game_object import GameObject
+from entities.player import Player
 from config import config
 
 class Collectible(GameObject, ABC):
-    def __init__(self, x, y, width=20, height=20):
+    draw_layer = 1
+
+    def __init__(self, physics_world, x, y, width=20, height=20):
         super().__init__(None, x, y, width, height)
         self.collected = False
         self.color = config.WHITE
+        
+        # Static sensor body so Box2D reports when the player touches this item
+        self.physics_world = physics_world
+        self.body = physics_world.create_sensor_body(x, y, width, height)
+        self.body.userData = self
 
     @abstractmethod
     def on_collect(self, player):
         pass
 
-    def update(self, player):
-        super().update()
-        if not self.collected and self.rect.colliderect(player.rect):
-            self.on_collect(player)
-            self.collected = True
+    def on_contact_begin(self, other):
+        if isinstance(other, Player):
+            self.collect(other)
+
+    def collect(self, player):
+        """Apply this item to the player, once"""
+        if self.collected:
+            return
+        self.on_collect(player)
+        self.mark_collected()
+
+    def mark_collected(self):
+        """Take the item out of play without applying it"""
+        self.collected = True
+        
+        # Collected items no longer need to be drawn or touched
+        self.unregister()
+        self.body.active = False
+
+    def capture_state(self):
+        state = super().capture_state()
+        state['collected'] = self.collected
+        return state
+
+    def restore_state(self, state):
+        self.collected = state['collected']
+        super().restore_state(state)
 
     def draw(self, screen, camera):
         if not self.collected:
@@ -3,15 +3,31 @@ import pygame
 import math
 import Box2D as b2
 from core.game_object import GameObject
+from core.profiler import profiler
 from physics.constants import *
+from physics.navigation import WALK, JUMP, FALL
+from physics.collision import collision_filter
 from config import config
 
 class EnemyStrategy(ABC):
+    kinematic = False  # Strategy moves a kinematic body rather than a dynamic one
+
     @abstractmethod
     def update(self, enemy, player):
         """Update enemy behavior based on player position"""
         pass
 
+    def get_state(self):
+        """Return any mutable state the strategy keeps between updates"""
+        return None
+
+    def on_navigation_changed(self):
+        """Called when the enemy's navigation graph is replaced"""
+        pass
+
+    def set_state(self, state):
+        pass
+
 class IdleStrategy(EnemyStrategy):
     def update(self, enemy, player):
         """Default behavior when player is not in range"""
@@ -55,14 +71,286 @@ class PatrolStrategy(EnemyStrategy):
         # Update velocity while maintaining vertical speed
         enemy.body.linearVelocity = (desired_velocity, velocity.y)
 
+    def get_state(self):
+        return self.direction
+
+    def set_state(self, state):
+        self.direction = state
+
+class WaypointPath:
+    def __init__(self, points, loop=True):
+        """
+        Points (in meters) a kinematic body travels between
+
+        Args:
+            points: Waypoints in Box2D coordinates
+            loop: Go from the last point back to the first; otherwise turn around
+        """
+        self.points = points
+        self.loop = loop
+        self.index = 0
+        self.step = 1
+
+    def _advance(self):
+        if len(self.points) < 2:
+            return
+        if self.loop:
+            self.index = (self.index + 1) % len(self.points)
+        else:
+            if not 0 <= self.index + self.step < len(self.points):
+                self.step = -self.step
+            self.index += self.step
+
+    def velocity(self, position, speed, reach):
+        """
+        Return the velocity that heads from position towards the current waypoint
+
+        Args:
+            position: Current body position in meters
+            speed: Travel speed in meters/second
+            reach: Distance in meters at which a waypoint counts as reached
+        """
+        for _ in range(len(self.points)):
+            target_x, target_y = self.points[self.index]
+            dx, dy = target_x - position[0], target_y - position[1]
+            distance = math.hypot(dx, dy)
+            if distance > reach:
+                return (dx / distance * speed, dy / distance * speed)
+            self._advance()
+        return (0.0, 0.0)
+
+    def get_state(self):
+        return (self.index, self.step)
+
+    def set_state(self, state):
+        self.index, self.step = state
+
+class KinematicPathStrategy(EnemyStrategy):
+    kinematic = True
+
+    def __init__(self, speed, waypoints, loop=True):
+        """
+        Float along a fixed path as a kinematic body, ignoring gravity and platforms
+
+        Args:
+            speed: Speed in meters/second
+            waypoints: (x, y) offsets in pixels from the enemy's spawn point
+            loop: Go from the last waypoint back to the first; otherwise turn around
+        """
+        self.speed = speed
+        self.waypoints = waypoints
+        self.loop = loop
+        self.path = None  # Built from the enemy's spawn point on first use
+
+    def update(self, enemy, player):
+        if self.path is None:
+            center_x = enemy.spawn_x + enemy.width / 2
+            center_y = enemy.spawn_y + enemy.height / 2
+            self.path = WaypointPath(
+                [to_box2d_coordinates((center_x + dx, center_y + dy)) for dx, dy in self.waypoints], self.loop
+            )
+        enemy.set_kinematic(True)
+        enemy.body.linearVelocity = self.path.velocity(enemy.body.position, self.speed, enemy.waypoint_reach(self.speed))
+
+    def get_state(self):
+        return self.path.get_state() if self.path else None
+
+    def set_state(self, state):
+        if self.path is not None:
+            # None was captured before the path existed: start over from the first waypoint
+            self.path.set_state(state if state is not None else (0, 1))
+
+class KinematicPatrolStrategy(PatrolStrategy):
+    kinematic = True
+
+    def __init__(self, speed, patrol_distance):
+        """
+        Patrol that runs as a kinematic body along the platform the enemy stands on,
+        so walking back and forth adds no platform contacts to the physics step.
+        Until the enemy has landed on a static platform it patrols as a dynamic body.
+        """
+        super().__init__(speed, patrol_distance)
+        self.path = None
+        self.platform = None  # Platform the path was built on
+
+    def _build_path(self, enemy, platform):
+        """Walk between the ends of the patrol range, kept on top of the platform"""
+        half_width = enemy.width / 2
+        left_limit, right_limit = platform.rect.left + half_width, platform.rect.right - half_width
+        spawn_center = enemy.spawn_x + half_width
+        distance = meters_to_pixels(self.patrol_distance)
+        left, right = max(left_limit, spawn_center - distance), min(right_limit, spawn_center + distance)
+        if left >= right:
+            # Patrol range is off this platform (e.g. after a chase), use all of it
+            left, right = left_limit, right_limit
+        y = platform.rect.top - enemy.height / 2
+        self.path = WaypointPath([to_box2d_coordinates((right, y)), to_box2d_coordinates((left, y))], loop=True)
+        if self.direction < 0:
+            self.path.index = 1
+        self.platform = platform
+
+    def update(self, enemy, player):
+        if not enemy.kinematic:
+            ground = enemy.ground_object
+            standing = enemy.ground_contacts > 0 and abs(enemy.body.linearVelocity.y) < 0.1
+            if not (standing and ground is not None and ground.is_static):
+                super().update(enemy, player)
+                return
+            if ground is not self.platform:
+                self._build_path(enemy, ground)
+            enemy.set_kinematic(True)
+
+        velocity = self.path.velocity(enemy.body.position, self.speed, enemy.waypoint_reach(self.speed))
+        if velocity[0]:
+            self.direction = 1 if velocity[0] > 0 else -1
+        enemy.body.linearVelocity = velocity
+
+    def get_state(self):
+        return (self.direction, self.path, self.platform, self.path.get_state() if self.path else None)
+
+    def set_state(self, state):
+        self.direction, self.path, self.platform, path_state = state
+        if self.path is not None:
+            self.path.set_state(path_state)
+
+class FloatChaseStrategy(EnemyStrategy):
+    kinematic = True
+
+    def __init__(self, speed):
+        self.speed = speed  # Speed in meters/second
+
+    def update(self, enemy, player):
+        """
+        Fly straight at the player as a kinematic body
+
+        Kinematic bodies don't collide with static ones, so the flight passes
+        through platforms on purpose: ghosts drift through walls. They still
+        touch the player, which is a dynamic body.
+        """
+        enemy.set_kinematic(True)
+        dx = player.body.position.x - enemy.body.position.x
+        dy = player.body.position.y - enemy.body.position.y
+        distance = math.hypot(dx, dy)
+        if distance > 1e-6:
+            enemy.body.linearVelocity = (dx / distance * self.speed, dy / distance * self.speed)
+
+# How close (pixels) an enemy has to be to a jump's takeoff point before it jumps
+TAKEOFF_TOLERANCE = 6
+
+class PathFollowStrategy(EnemyStrategy):
+    def __init__(self, speed):
+        """
+        Base for strategies that travel between platforms along the level's
+        navigation graph, walking, jumping and dropping as the path requires
+
+        Args:
+            speed: Walking speed in meters/second. Jumps and drops are taken at
+                the graph's run speed so every arc in the graph is reachable.
+        """
+        self.speed = speed
+        self.edge = None  # Move currently being made between two platforms
+        self.last_target = None
+
+    @abstractmethod
+    def target(self, enemy, player):
+        """Return (platform index or None, x in pixels) of where the enemy wants to be"""
+        pass
+
+    def _move_towards(self, enemy, x, speed):
+        dx = x - meters_to_pixels(enemy.body.position.x)
+        direction = 0 if abs(dx) <= TAKEOFF_TOLERANCE else 1 if dx > 0 else -1
+        enemy.body.linearVelocity = (speed * direction, enemy.body.linearVelocity.y)
+
+    def _clamp_to_platform(self, enemy, platform, x):
+        """Keep x far enough from the platform's ends that the enemy doesn't run off"""
+        half_width = enemy.width / 2
+        return max(platform.rect.left + half_width, min(platform.rect.right - half_width, x))
+
+    def update(self, enemy, player):
+        graph = enemy.navigation
+        target, target_x = self.target(enemy, player)
+        if graph is None:
+            self._move_towards(enemy, target_x, self.speed)
+            return
+
+        current = graph.locate(enemy)
+        if current is None:
+            # In the air: steer towards where the current move lands
+            if self.edge is not None:
+                self._move_towards(enemy, self.edge.landing_x, graph.run_speed)
+            return
+
+        self.edge = graph.next_edge(current, target) if target is not None else None
+        if self.edge is None:
+            # Already there, or no way there: follow along this platform without falling off
+            self._move_towards(enemy, self._clamp_to_platform(enemy, graph.platforms[current], target_x), self.speed)
+            return
+
+        edge = self.edge
+        if edge.kind == WALK:
+            self._move_towards(enemy, edge.landing_x, self.speed)
+            return
+        if edge.kind == FALL:
+            # Run off the edge at the speed the graph worked out the drop's reach with
+            self._move_towards(enemy, edge.landing_x, graph.run_speed)
+            return
+
+        if abs(edge.takeoff_x - meters_to_pixels(enemy.body.position.x)) > TAKEOFF_TOLERANCE:
+            self._move_towards(enemy, edge.takeoff_x, self.speed)
+            return
+
+        # At the takeoff point: jump unless already on the way up
+        body = enemy.body
+        if body.linearVelocity.y >= 0:
+            body.ApplyLinearImpulse((0, -graph.jump_speed * body.mass), body.worldCenter, True)
+        self._move_towards(enemy, edge.landing_x, graph.run_speed)
+
+    def get_state(self):
+        return (self.edge, self.last_target)
+
+    def on_navigation_changed(self):
+        # Edges and platform indices belong to the old graph
+        self.edge = None
+        self.last_target = None
+
+    def set_state(self, state):
+        self.edge, self.last_target = state
+
+class PathChaseStrategy(PathFollowStrategy):
+    """Chases the player across platforms using cached navigation graph paths"""
+    def target(self, enemy, player):
+        graph = enemy.navigation
+        if graph is not None:
+            # While the player is airborne keep heading for where they last stood
+            platform = graph.locate(player)
+            if platform is not None:
+                self.last_target = platform
+        return self.last_target, meters_to_pixels(player.body.position.x)
+
 class Enemy(GameObject):
-    def __init__(self, physics_world, x, y, width, height, color, detection_radius):
-        super().__init__(physics_world, x, y, width, height)
+    draw_layer = 2
+    collision_category = 'enemy'
+
+    def __init__(self, physics_world, x, y, width, height, color, detection_radius, kinematic=False):
+        super().__init__(physics_world, x, y, width, height, kinematic)
         self.color = color
         self.detection_radius = detection_radius
         self.spawn_x = x
         self.spawn_y = y
         
+        # Platform navigation graph used by path-following strategies, set per level
+        self.navigation = None
+        
+        # Simulation level of detail: sleeping enemies are skipped by physics and AI
+        self.simulated = True
+        self.sleep_velocity = None
+        
+        # Velocity chosen by the last think, kept up between think-ticks
+        self.desired_velocity = None
+        
+        # Kinematic enemies follow paths without gravity or platform contacts
+        self.kinematic = kinematic
+        
         # Set up physics properties
         self.body.fixedRotation = True  # Prevent rotation
         for fixture in self.body.fixtures:
@@ -82,26 +370,103 @@ class Enemy(GameObject):
                 pixels_to_meters(2),  # Small height for ground detection
             )),
             friction=0.3,  # Higher friction for ground movement
-            isSensor=False
+            isSensor=False,
+            **collision_filter('sensor')  # Only needs to touch terrain
         )
 
+    def set_navigation(self, navigation):
+        """Use a new navigation graph, e.g. after platforms were streamed in or out"""
+        self.navigation = navigation
+        for strategy in (self.idle_strategy, self.patrol_strategy, self.chase_strategy):
+            if strategy is not None:
+                strategy.on_navigation_changed()
+
+    def destroy(self):
+        # Keep schedulers holding on to this enemy from thinking with a destroyed body
+        self.simulated = False
+        super().destroy()
+
     def detect_player(self, player):
         dx = player.rect.centerx - self.rect.centerx
         dy = player.rect.centery - self.rect.centery
         distance = math.sqrt(dx * dx + dy * dy)
         return distance <= self.detection_radius
 
-    def update(self, player):
+    def update(self, player=None):
+        """Sync with physics and, if a player is given, run this enemy's AI"""
+        # Off-screen enemies keep their strategy state but don't think or move
+        if not self.simulated:
+            return
+        
         super().update()  # Update GameObject (syncs physics position)
         
+        if player is not None:
+            self.think(player)
+
+    def think(self, player):
+        """Pick and apply a strategy based on the player's position"""
         # Update strategy
         if self.detect_player(player):
             self.active_strategy = self.chase_strategy
         else:
             self.active_strategy = self.patrol_strategy
         
+        # Strategies that need collisions and gravity get a dynamic body back
+        if self.kinematic and not self.active_strategy.kinematic:
+            self.set_kinematic(False)
+        
         # Apply current strategy
-        self.active_strategy.update(self, player)
+        with profiler.scope('enemy_strategy'):
+            self.active_strategy.update(self, player)
+        velocity = self.body.linearVelocity
+        self.desired_velocity = (velocity.x, velocity.y)
+
+    def coast(self):
+        """Keep moving at the last desired velocity on frames this enemy doesn't think"""
+        if self.desired_velocity is not None:
+            if self.kinematic:
+                self.body.linearVelocity = self.desired_velocity
+            else:
+                self.body.linearVelocity = (self.desired_velocity[0], self.body.linearVelocity.y)
+
+    def set_kinematic(self, kinematic):
+        """Switch the body between kinematic path movement and full dynamic physics"""
+        if kinematic == self.kinematic:
+            return
+        self.kinematic = kinematic
+        if kinematic:
+            self.body.type = b2.b2_kinematicBody
+            self.body.linearVelocity = (0, 0)
+        else:
+            self.body.type = b2.b2_dynamicBody
+        self.body.awake = True
+
+    def waypoint_reach(self, speed):
+        """Distance in meters within which a path waypoint counts as reached"""
+        # Enemies may only think every few frames, so allow for a few steps of travel
+        return max(speed * self.physics_world.time_step * 2, pixels_to_meters(2))
+
+    def capture_state(self):
+        state = super().capture_state()
+        state['kinematic'] = self.kinematic
+        state['simulated'] = self.simulated
+        state['active_strategy'] = self.active_strategy
+        state['strategies'] = [
+            (strategy, strategy.get_state())
+            for strategy in (self.idle_strategy, self.patrol_strategy, self.chase_strategy)
+            if strategy is not None
+        ]
+        return state
+
+    def restore_state(self, state):
+        self.set_kinematic(state['kinematic'])
+        super().restore_state(state)
+        self.simulated = state['simulated']
+        self.sleep_velocity = None
+        self.desired_velocity = None
+        self.active_strategy = state['active_strategy']
+        for strategy, strategy_state in state['strategies']:
+            strategy.set_state(strategy_state)
 
     def draw(self, screen, camera):
         pygame.draw.rect(screen, self.color, camera.apply(self.rect))
@@ -122,8 +487,8 @@ class Slime(Enemy):
 class Goblin(Enemy):
     def __init__(self, physics_world, x, y):
         super().__init__(physics_world, x, y, 40, 40, (255, 100, 0), 250)
-        self.patrol_strategy = PatrolStrategy(3, 200)
-        self.chase_strategy = ChaseStrategy(4)
+        self.patrol_strategy = KinematicPatrolStrategy(3, 200)
+        self.chase_strategy = PathChaseStrategy(4)
         
         # Goblin-specific physics properties
         for fixture in self.body.fixtures:
@@ -131,9 +496,11 @@ class Goblin(Enemy):
 
 class Ghost(Enemy):
     def __init__(self, physics_world, x, y):
-        super().__init__(physics_world, x, y, 35, 50, (200, 200, 255), 300)
-        self.patrol_strategy = PatrolStrategy(1, 300)
-        self.chase_strategy = ChaseStrategy(6)
+        # Ghosts float: a kinematic body that drifts along a loop and flies at the player,
+        # passing through platforms as ghosts do
+        super().__init__(physics_world, x, y, 35, 50, (200, 200, 255), 300, kinematic=True)
+        self.patrol_strategy = KinematicPathStrategy(1, [(0, -40), (150, -90), (300, -40), (150, 0)])
+        self.chase_strategy = FloatChaseStrategy(6)
         
         # Ghost-specific physics properties
         for fixture in self.body.fixtures:
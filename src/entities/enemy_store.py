@@ -0,0 +1,142 @@
+import numpy as np
+from physics.constants import PIXELS_PER_METER, pixels_to_meters
+from .enemy import PatrolStrategy, ChaseStrategy
+
+# Strategy ids stored per enemy
+IDLE = 0
+PATROL = 1
+CHASE = 2
+
+class EnemyStore:
+    def __init__(self, enemies):
+        """
+        Struct-of-arrays copy of enemy AI state that runs detection and the
+        patrol/chase strategies for all enemies in a few vectorized operations
+
+        Args:
+            enemies: Enemies to drive. Enemies with strategies other than plain
+                PatrolStrategy/ChaseStrategy are left in self.fallback for the
+                caller to let think one at a time.
+        """
+        self.enemies = []
+        self.fallback = []
+
+        # Per-frame state read from the bodies (meters)
+        self.position = np.zeros((0, 2))
+        self.velocity_y = np.zeros(0)
+        self.simulated = np.zeros(0, dtype=bool)
+
+        # Static per-enemy parameters
+        self.spawn_x = np.zeros(0)
+        self.detection_radius_sq = np.zeros(0)
+        self.patrol_speed = np.zeros(0)
+        self.patrol_distance = np.zeros(0)
+        self.chase_speed = np.zeros(0)
+
+        # Mutable strategy state, mirrored back onto the strategy objects when it changes
+        self.patrol_direction = np.zeros(0)
+        self.strategy = np.zeros(0, dtype=np.int8)
+        self.add(enemies)
+
+    def add(self, enemies):
+        """Start driving more enemies, e.g. ones streamed in with a level chunk"""
+        added = [enemy for enemy in enemies if self.can_vectorize(enemy)]
+        self.fallback += [enemy for enemy in enemies if not self.can_vectorize(enemy)]
+        if not added:
+            return
+        count = len(added)
+        self.enemies += added
+        self.position = np.concatenate((self.position, np.zeros((count, 2))))
+        self.velocity_y = np.concatenate((self.velocity_y, np.zeros(count)))
+        self.simulated = np.concatenate((self.simulated, np.zeros(count, dtype=bool)))
+        self.spawn_x = np.concatenate((self.spawn_x, [pixels_to_meters(enemy.spawn_x) for enemy in added]))
+        self.detection_radius_sq = np.concatenate((self.detection_radius_sq, [enemy.detection_radius ** 2 for enemy in added]))
+        self.patrol_speed = np.concatenate((self.patrol_speed, [enemy.patrol_strategy.speed for enemy in added]))
+        self.patrol_distance = np.concatenate((self.patrol_distance, [enemy.patrol_strategy.patrol_distance for enemy in added]))
+        self.chase_speed = np.concatenate((self.chase_speed, [enemy.chase_strategy.speed for enemy in added]))
+        self.patrol_direction = np.concatenate((self.patrol_direction, [enemy.patrol_strategy.direction for enemy in added]))
+        self.strategy = np.concatenate((self.strategy, np.array([self._strategy_id(enemy) for enemy in added], dtype=np.int8)))
+
+    def remove(self, enemies):
+        """Stop driving enemies, e.g. ones unloaded with their level chunk"""
+        removed = set(enemies)
+        if not removed:
+            return
+        self.fallback = [enemy for enemy in self.fallback if enemy not in removed]
+        keep = np.array([enemy not in removed for enemy in self.enemies], dtype=bool)
+        if keep.all():
+            return
+        self.enemies = [enemy for enemy in self.enemies if enemy not in removed]
+        for name in ('position', 'velocity_y', 'simulated', 'spawn_x', 'detection_radius_sq', 'patrol_speed',
+                     'patrol_distance', 'chase_speed', 'patrol_direction', 'strategy'):
+            setattr(self, name, getattr(self, name)[keep])
+
+    @staticmethod
+    def can_vectorize(enemy):
+        return (type(enemy.patrol_strategy) is PatrolStrategy
+                and type(enemy.chase_strategy) is ChaseStrategy)
+
+    def _strategy_id(self, enemy):
+        if enemy.active_strategy is enemy.chase_strategy:
+            return CHASE
+        if enemy.active_strategy is enemy.patrol_strategy:
+            return PATROL
+        return IDLE
+
+    def refresh(self):
+        """Re-read strategy state from the enemies (e.g. after a level reset)"""
+        for i, enemy in enumerate(self.enemies):
+            self.patrol_direction[i] = enemy.patrol_strategy.direction
+            self.strategy[i] = self._strategy_id(enemy)
+
+    def _gather(self):
+        position = self.position
+        velocity_y = self.velocity_y
+        simulated = self.simulated
+        for i, enemy in enumerate(self.enemies):
+            simulated[i] = enemy.simulated
+            if enemy.simulated:
+                body = enemy.body
+                body_position = body.position
+                position[i, 0] = body_position.x
+                position[i, 1] = body_position.y
+                velocity_y[i] = body.linearVelocity.y
+
+    def update(self, player):
+        """Run detection, strategy selection and movement for every vectorized enemy"""
+        if not self.enemies:
+            return
+        self._gather()
+        simulated = self.simulated
+        x = self.position[:, 0]
+
+        # Detection radius is in pixels; compare squared distances instead of taking roots
+        player_position = player.body.position
+        offset = (self.position - (player_position.x, player_position.y)) * PIXELS_PER_METER
+        detected = np.einsum('ij,ij->i', offset, offset) <= self.detection_radius_sq
+
+        # Patrolling enemies turn around once they're too far from their spawn point
+        turn = simulated & ~detected & (np.abs(x - self.spawn_x) > self.patrol_distance)
+        self.patrol_direction[turn] *= -1
+
+        chase_direction = np.where(player_position.x - x > 0, 1.0, -1.0)
+        velocity_x = np.where(detected,
+                              self.chase_speed * chase_direction,
+                              self.patrol_speed * self.patrol_direction)
+
+        # Write the desired velocities back to the bodies, keeping vertical speed
+        indices = np.flatnonzero(simulated)
+        enemies = self.enemies
+        for i, vx, vy in zip(indices.tolist(), velocity_x[indices].tolist(), self.velocity_y[indices].tolist()):
+            enemies[i].body.linearVelocity = (vx, vy)
+
+        # Mirror changed strategy state onto the enemy objects
+        for i in np.flatnonzero(turn).tolist():
+            enemies[i].patrol_strategy.direction = int(self.patrol_direction[i])
+
+        strategy = np.where(detected, CHASE, PATROL).astype(np.int8)
+        changed = simulated & (strategy != self.strategy)
+        for i in np.flatnonzero(changed).tolist():
+            enemy = enemies[i]
+            enemy.active_strategy = enemy.chase_strategy if strategy[i] == CHASE else enemy.patrol_strategy
+        self.strategy[changed] = strategy[changed]
@@ -5,8 +5,8 @@ from components.animations import FloatingAnimation, PulsingAnimation
 from config import config
 
 class Coin(Collectible):
-    def __init__(self, x, y):
-        super().__init__(x, y, 15, 15)
+    def __init__(self, physics_world, x, y):
+        super().__init__(physics_world, x, y, 15, 15)
         self.color = (255, 215, 0)  # Gold color
         self.add_component('pulse', PulsingAnimation(scale_range=0.1, speed=0.003))
 
@@ -15,8 +15,8 @@ class Coin(Collectible):
         player.collect_coin()
 
 class JumpBoost(Collectible):
-    def __init__(self, x, y):
-        super().__init__(x, y, 20, 20)
+    def __init__(self, physics_world, x, y):
+        super().__init__(physics_world, x, y, 20, 20)
         self.color = (0, 255, 255)
         self.boost_amount = 3
         self.duration = 50000
@@ -28,8 +28,8 @@ class JumpBoost(Collectible):
         self.end_time = pygame.time.get_ticks() + self.duration
         self.audio_manager.play_sound("magic-boost")
 
-    def update(self, player):
-        super().update(player)
+    def update(self):
+        super().update()
         #if self.collected and pygame.time.get_ticks() >= self.end_time:
             #player.jump_force = pixels_to_meters(config.JUMP_FORCE)
             #self.audio_manager.play_sound("expire")
\ No newline at end of file
@@ -4,29 +4,33 @@ from physics.constants import *
 from config import config
 
 class Platform(GameObject):
+    is_static = True  # Drawn from baked geometry chunks rather than per frame
+
     def __init__(self, physics_world, x, y, width, height):
         # Don't call GameObject.__init__ since we want a static body
         self.width = width
         self.height = height
         self.original_y = y
+        self.physics_world = physics_world
+        self.previous_position = None
+        self.ground_contacts = 0
+        self.ground_object = None
         self.components = {}
+        self.render_transforms = []
+        self.spatial_hash = None
+        self.geometry_baker = None
         
         # Create static body
         self.body = physics_world.create_static_body(x, y, width, height)
         self.body.userData = self
         
-        # Create pygame rect for rendering
-        self.rect = pygame.Rect(x, y, width, height)
+        # Static bodies never move, so compute the render rect once from the body
+        self.rect = self._rect_from_body()
         
         # Platform specific properties
         self.color = config.GREEN
     
-    def update(self):
-        # Static bodies don't need position updates, but components might need updating
-        for component in self.components.values():
-            component.update()
-    
-    def draw(self, screen, camera):
+    def _rect_from_body(self):
         platform_pos = to_pygame_coordinates(self.body.position)
         fixture = self.body.fixtures[0]
         
@@ -36,11 +40,28 @@ class Platform(GameObject):
         half_height = abs(vertices[0][1])  # Distance from center to edge
         
         # Calculate the rect based on the Box2D body
-        self.rect = pygame.Rect(
+        return pygame.Rect(
             platform_pos[0] - meters_to_pixels(half_width),
             platform_pos[1] - meters_to_pixels(half_height),
             meters_to_pixels(half_width * 2),
             meters_to_pixels(half_height * 2)
         )
+    
+    def set_position(self, x, y):
+        """Move the platform's top-left corner and rebake the chunks it touches"""
+        old_rect = self.rect
+        self.body.position = to_box2d_coordinates((x + self.width/2, y + self.height/2))
+        self.rect = self._rect_from_body()
         
-        pygame.draw.rect(screen, self.color, camera.apply(self.rect)) 
\ No newline at end of file
+        if self.spatial_hash is not None:
+            self.spatial_hash.update(self)
+        if self.geometry_baker is not None:
+            self.geometry_baker.invalidate(self, old_rect)
+    
+    def update(self):
+        # Static bodies don't need position updates, but components might need updating
+        for component in self.components.values():
+            component.update()
+    
+    def draw(self, screen, camera):
+        pygame.draw.rect(screen, self.color, camera.apply(self.rect)) 
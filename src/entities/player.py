@@ -1,14 +1,18 @@
 from core.game_object import GameObject
 from config import config
+from entities.enemy import Enemy
 from physics.constants import *
-import math
+from physics.collision import collision_filter
 import Box2D as b2
 
 class Player(GameObject):
+    collision_category = 'player'
+
     def __init__(self, physics_world, x, y):
         super().__init__(physics_world, x, y, config.PLAYER_WIDTH, config.PLAYER_HEIGHT)
         self.coins = 0
         self.jump_force = pixels_to_meters(config.JUMP_FORCE)
+        self.hit_enemy = False
         
         # Set up player-specific physics properties
         self.body.fixedRotation = True
@@ -23,7 +27,8 @@ class Player(GameObject):
                     pixels_to_meters(2),  # Small height for ground detection
                 )),
                 friction=0.3,  # Higher friction for ground movement
-                isSensor=False
+                isSensor=False,
+                **collision_filter('sensor')  # Only needs to touch terrain
             )
     
     def move(self, direction):
@@ -34,29 +39,9 @@ class Player(GameObject):
         self.body.linearVelocity = (desired_velocity, velocity.y)
     
     def jump(self):
-        # Check if player's bottom edge is touching something
-        can_jump = False
-        contact_body = None
-        player_bottom = self.body.position.y + pixels_to_meters(self.height/2)
-        
-        # Get all contacts
-        for edge in self.body.contacts:
-            if not edge.contact:
-                continue
-                
-            if not edge.contact.touching:
-                continue
-                
-            # Get the manifold points to check contact position
-            manifold = edge.contact.manifold
-            normal = manifold.localNormal
-            
-            # Check if contact normal is pointing upward (bottom collision)
-            if math.fabs(normal.y) > 0.707:  # cos(45°) ≈ 0.707, allows for some slope
-                # Get the other body
-                contact_body = edge.contact.fixtureB.body if edge.contact.fixtureA.body == self.body else edge.contact.fixtureA.body
-                can_jump = True
-                break
+        # The contact listener counts contacts the player is standing on
+        can_jump = self.ground_contacts > 0
+        contact_body = self.ground_object.body if self.ground_object else None
         
         if can_jump and contact_body:
             # Calculate jump impulse based on mass
@@ -81,6 +66,20 @@ class Player(GameObject):
             # Play jump sound
             self.audio_manager.play_sound('jump')
     
+    def on_contact_begin(self, other):
+        if isinstance(other, Enemy):
+            self.hit_enemy = True
+    
+    def capture_state(self):
+        state = super().capture_state()
+        state['stats'] = (self.coins, self.jump_force)
+        return state
+    
+    def restore_state(self, state):
+        super().restore_state(state)
+        self.coins, self.jump_force = state['stats']
+        self.hit_enemy = False
+    
     def collect_coin(self):
         self.coins += 1
     
@@ -1,5 +1,8 @@
+import argparse
 import pygame
+import struct
 import sys
+import zlib
 from config import config
 from core.camera import Camera
 from entities.player import Player
@@ -7,52 +10,295 @@ from entities.items import Coin, JumpBoost
 from entities.enemy import Slime, Goblin, Ghost
 from ui.overlay import GameUI
 from physics.world import PhysicsWorld
+from physics.lod import SimulationLOD
+from physics.navigation import NavigationGraph
 from physics.constants import *
 from entities.platform import Platform
 from core.audio import AudioManager
 from core.background import ParallaxBackground, TileMode
+from core.asset_cache import ImageCache
+from core.spatial_hash import SpatialHash
+from core.level_file import LevelData
+from core.level_streamer import LevelStreamer
+from core.level_generator import ChunkGenerator, GeneratedLevel
+from core.culling import ViewCuller
+from core.static_geometry import StaticGeometryBaker
+from core.profiler import profiler
+from core.level_snapshot import LevelSnapshot
+from components.animation_system import animation_system
+from ui.text_cache import text_cache
+from core.input import KeyboardInput, InputRecorder, ReplayInput
+from entities.ai_scheduler import AIScheduler
+
+try:
+    from entities.enemy_store import EnemyStore
+except ImportError:  # NumPy not installed: enemies think one at a time
+    EnemyStore = None
 
 audio_manager = AudioManager()
 player, platforms, collectibles, enemies = None, None, None, None
+level_data = None
+level_streamer = None
+endless_seed = None  # Seed of the generated endless level, None to play the level file
+spatial_hash = None
+navigation_graph = None
+level_snapshot = None
+enemy_store = None
+geometry_baker = StaticGeometryBaker()
+ai_scheduler = AIScheduler()
 is_paused = False
 
 # Add death zone constant
 DEATH_ZONE = config.LEVEL_HEIGHT + 300  # 300 pixels below level bottom
 
-def create_platforms(physics_world):
-    """Create all platforms for the level"""
-    return [
-        Platform(physics_world, 0, config.LEVEL_HEIGHT - 40, 300, 40),
-        Platform(physics_world, 400, config.LEVEL_HEIGHT - 40, 200, 40),
-        Platform(physics_world, 700, config.LEVEL_HEIGHT - 40, 400, 40),
-        Platform(physics_world, 1200, config.LEVEL_HEIGHT - 40, 200, 40),
-        Platform(physics_world, 1500, config.LEVEL_HEIGHT - 40, 300, 40),
-        Platform(physics_world, 1900, config.LEVEL_HEIGHT - 40, 500, 40),
-        # Add more platforms for different levels
-        Platform(physics_world, 300, config.LEVEL_HEIGHT - 200, 200, 20),
-        Platform(physics_world, 600, config.LEVEL_HEIGHT - 300, 200, 20),
-        Platform(physics_world, 900, config.LEVEL_HEIGHT - 400, 200, 20),
-    ]
+# Level file object type names -> classes
+ENEMY_CLASSES = {'slime': Slime, 'goblin': Goblin, 'ghost': Ghost}
+COLLECTIBLE_CLASSES = {'coin': Coin, 'jump_boost': JumpBoost}
+
+def load_level_data():
+    """Read the level file (or start generating the endless level) once and keep it for every later level load"""
+    global level_data
+    current_seed = level_data.generator.seed if isinstance(level_data, GeneratedLevel) else None
+    if level_data is not None and current_seed != endless_seed:
+        close_level_data()  # Switching between the level file and generated levels
+    if level_data is None:
+        if endless_seed is not None:
+            level_data = GeneratedLevel(ChunkGenerator(endless_seed))
+        else:
+            level_data = LevelData.load(config.LEVEL_FILE)
+    return level_data
+
+def close_level_data():
+    """Forget the loaded level, stopping its generator thread if it is a generated one"""
+    global level_data
+    if isinstance(level_data, GeneratedLevel):
+        level_data.stop()
+    level_data = None
+
+def create_chunk(physics_world, chunk, shared_platform, x_offset=0):
+    """
+    Create the platforms, collectibles and enemies of one level chunk
+
+    Objects are created one at a time as the generator is advanced, so the
+    streamer can spread a chunk's bodies over several frames.
+
+    Args:
+        shared_platform: Called with each platform tuple just before it would be
+            created; returns True to skip it because a neighbouring chunk that
+            shares the platform has already created its body
+
+    Yields:
+        ('platform' | 'collectible' | 'enemy', game object) pairs, platforms first
+    """
+    for platform in chunk.platforms:
+        if shared_platform(platform):
+            continue
+        x, y, width, height = platform
+        yield 'platform', Platform(physics_world, x_offset + x, y, width, height)
+    for kind, x, y in chunk.collectibles:
+        yield 'collectible', COLLECTIBLE_CLASSES[kind](physics_world, x_offset + x, y)
+    for kind, x, y in chunk.enemies:
+        yield 'enemy', ENEMY_CLASSES[kind](physics_world, x_offset + x, y)
+
+def load_level(physics_world, copies=1, streamed=False):
+    """
+    Build the level's objects and bodies and capture their starting state
+
+    Args:
+        physics_world: World to create the level's bodies in
+        copies: Number of times the level is repeated side by side (used to build
+            scaled benchmark scenarios)
+        streamed: Only create the chunks near the camera, loading and unloading
+            them as it moves, instead of the whole level up front. Generated
+            endless levels are always streamed.
+    """
+    global player, platforms, collectibles, enemies, spatial_hash, level_snapshot, level_streamer
+    animation_system.clear()
+    ai_scheduler.reset()
+    level = load_level_data()
+    player = Player(physics_world, *level.player_spawn)
+
+    # Index level objects so drawing only looks at cells near the camera
+    spatial_hash = SpatialHash()
+    geometry_baker.clear()
+
+    if streamed or isinstance(level, GeneratedLevel):
+        # The spawn chunk is created now, the rest by update_entities over the next frames
+        level_streamer = LevelStreamer(level, physics_world, create_chunk, spatial_hash, geometry_baker)
+        level_streamer.load_at(player.rect.centerx)
+        platforms = level_streamer.platforms
+        collectibles = level_streamer.collectibles
+        enemies = level_streamer.enemies
+        level_snapshot = LevelSnapshot([player])
+    else:
+        level_streamer = None
+        platforms, collectibles, enemies = [], [], []
+        created = set()
+
+        def shared_platform(platform):
+            # Platforms listed in several chunks are created by the first of them
+            if platform in created:
+                return True
+            created.add(platform)
+            return False
+
+        for i in range(copies):
+            created.clear()
+            for index in range(len(level)):
+                for kind, game_object in create_chunk(physics_world, level.chunk(index), shared_platform, i * level.width):
+                    if kind == 'platform':
+                        platforms.append(game_object)
+                    elif kind == 'collectible':
+                        collectibles.append(game_object)
+                    else:
+                        enemies.append(game_object)
+
+        for game_object in platforms + collectibles + enemies:
+            game_object.register(spatial_hash)
+        for platform in platforms:
+            geometry_baker.add_platform(platform)
+
+        # Platforms never change, so only moving and collectable objects are captured
+        level_snapshot = LevelSnapshot([player] + collectibles + enemies)
+
+    # Bake static platforms into chunk surfaces
+    geometry_baker.bake()
+    refresh_level_objects(physics_world)
+
+def refresh_level_objects(physics_world):
+    """Rebuild everything that depends on which platforms and enemies exist"""
+    global navigation_graph, enemy_store
+
+    # Work out how enemies can get between platforms once, so chasing is a path lookup
+    navigation_graph = NavigationGraph(platforms, gravity=physics_world.world.gravity.y)
+    for enemy in enemies:
+        enemy.set_navigation(navigation_graph)
+
+    # Run enemy AI over contiguous arrays when NumPy is available
+    enemy_store = EnemyStore(enemies) if EnemyStore else None
+
+    if level_streamer:
+        level_streamer.take_changes()  # Already part of the rebuild
+
+def apply_streamed_changes():
+    """Update the navigation graph and enemy store with the objects streamed in and out"""
+    added_platforms, removed_platforms, added_enemies, removed_enemies = level_streamer.take_changes()
+    navigation_graph.add_platforms(added_platforms)
+    navigation_graph.remove_platforms(removed_platforms)
+    if removed_platforms:
+        # Moves being made may lead onto platforms that are gone
+        for enemy in enemies:
+            enemy.set_navigation(navigation_graph)
+    else:
+        for enemy in added_enemies:
+            enemy.set_navigation(navigation_graph)
+    if enemy_store:
+        enemy_store.add(added_enemies)
+        enemy_store.remove(removed_enemies)
 
 def reset_game(physics_world):
-    """Reset the game to initial state"""
-    global player, platforms, collectibles, enemies
-    player = Player(physics_world, 100, 300)
-    platforms = create_platforms(physics_world)
-    collectibles = [
-        Coin(300, config.LEVEL_HEIGHT - 100),
-        Coin(500, config.LEVEL_HEIGHT - 100),
-        Coin(700, 300),
-        JumpBoost(900, config.LEVEL_HEIGHT - 100),
-        Coin(1200, 200),
-        JumpBoost(1500, 300),
-    ]
-    enemies = [
-        Slime(physics_world, 400, config.LEVEL_HEIGHT - 60),
-        Goblin(physics_world, 800, config.LEVEL_HEIGHT - 80),
-        Ghost(physics_world, 1200, config.LEVEL_HEIGHT - 90),
-        Slime(physics_world, 1600, config.LEVEL_HEIGHT - 60),
-    ]
+    """Reset the game to initial state, reusing the existing bodies"""
+    if level_snapshot is None:
+        load_level(physics_world)
+    else:
+        level_snapshot.restore()
+        ai_scheduler.reset()
+        if level_streamer:
+            # Put the loaded chunks back in place and make sure the spawn chunk is complete
+            level_streamer.reset()
+            level_streamer.load_at(player.rect.centerx)
+            apply_streamed_changes()
+        if enemy_store:
+            enemy_store.refresh()
+
+def create_background():
+    """Load the parallax background layers"""
+    background = ParallaxBackground(composite=True, image_cache=ImageCache())
+    background.add_layer("assets/backgrounds/sky.png", 2.0, TileMode.HORIZONTAL)
+    background.add_layer("assets/backgrounds/landscape5.png", 0.99, TileMode.NONE, scale=1.7, y_offset=-350)  
+    background.add_layer("assets/backgrounds/mountains2.png", 0.97, TileMode.NONE, scale=0.8, x_offset=-100, y_offset=250)
+    background.add_layer("assets/backgrounds/landscape2.png", 0.93, TileMode.HORIZONTAL, scale=0.8, x_offset=0, y_offset=50) 
+    background.add_layer("assets/backgrounds/landscape1.png", 0.92, TileMode.HORIZONTAL, scale=0.8, x_offset=0, y_offset=50) 
+    background.add_layer("assets/backgrounds/grass.png", 0.90, TileMode.NONE, scale=0.8, x_offset=0, y_offset=175) 
+    #background.add_layer("../assets/backgrounds/trees.png", 0.6, TileMode.HORIZONTAL)  # Trees tile horizontally
+    return background
+
+def update_physics(physics_world, frame_time, direction):
+    """Apply movement input and advance the physics simulation"""
+    player.move(direction)
+
+    # Run as many fixed physics steps as the elapsed time calls for
+    with profiler.scope('physics'):
+        physics_world.update(frame_time)
+
+def kill_player(physics_world):
+    """Reset the level after the player died and return where it happened"""
+    death_position = player.rect.center
+    reset_game(physics_world)
+    audio_manager.play_sound('death')
+    return death_position
+
+def update_entities(physics_world, camera, simulation_lod=None):
+    """
+    Sync game objects with physics, run enemy AI and react to player collisions
+
+    Returns:
+        The player's (x, y) position in pixels if they died this frame, else None
+    """
+    player.update()
+    
+    for platform in platforms:
+        platform.update()
+    
+    # Check death zone
+    if player.rect.top >= DEATH_ZONE:
+        return kill_player(physics_world)
+
+    camera.update(player)
+
+    # Create the chunks coming into range and destroy the ones left behind
+    if level_streamer:
+        with profiler.scope('streaming'):
+            level_streamer.update(camera.view)
+            apply_streamed_changes()
+
+    # Evaluate every pickup animation from one clock sample. Collectibles are static
+    # sensors animated only when drawn, so they need no per-frame update of their own
+    animation_system.update()
+
+    # Put enemies far from the camera to sleep before they cost any AI or physics
+    if simulation_lod:
+        simulation_lod.update(enemies)
+
+    # Update enemies with physics
+    with profiler.scope('enemies'):
+        for enemy in enemies:
+            enemy.update()
+        if enemy_store:
+            with profiler.scope('enemy_strategy'):
+                enemy_store.update(player)
+            # Enemies the store can't vectorize think on their scheduled frames
+            ai_scheduler.update(enemy_store.fallback, player, camera)
+        else:
+            ai_scheduler.update(enemies, player, camera)
+
+    # Pickups and enemy hits arrive as contact events from the physics step
+    if player.hit_enemy:
+        return kill_player(physics_world)
+    return None
+
+def draw_entities(screen, camera, view_culler):
+    """Draw platforms, collectibles, enemies and the player"""
+    # Draw baked platform chunks, then the collectibles and enemies inside the view
+    with profiler.scope('platforms_draw'):
+        geometry_baker.draw(screen, camera)
+    with profiler.scope('entities_draw'):
+        if view_culler.spatial_hash is not spatial_hash:
+            view_culler.set_spatial_hash(spatial_hash)
+        view_culler.draw(screen)
+    
+    if player.rect.top < DEATH_ZONE:
+        pygame.draw.rect(screen, config.RED, camera.apply(player.rect))
 
 def handle_pause():
     global is_paused
@@ -60,86 +306,121 @@ def handle_pause():
 
     if is_paused:
         audio_manager.play_sound('pause')
+        audio_manager.music.pause()
     else:
         audio_manager.play_sound('unpause')
+        audio_manager.music.resume()
 
-def main():
-    global is_paused
+def state_checksum():
+    """CRC32 of the player's and enemies' body states and the coin count"""
+    values = []
+    for game_object in [player] + enemies:
+        position = game_object.body.position
+        velocity = game_object.body.linearVelocity
+        values += (position.x, position.y, velocity.x, velocity.y)
+    data = struct.pack(f'<{len(values)}d', *values) + struct.pack('<i', player.coins)
+    return zlib.crc32(data)
+
+def quit_game(input_source):
+    """Close the input source (flushing any recording), stop level generation and exit"""
+    input_source.close()
+    close_level_data()
+    pygame.quit()
+    sys.exit()
+
+def toggle_profiler(ui):
+    """Turn the frame profiler and its overlay on or off"""
+    enabled = profiler.toggle()
+    ui.show_profiler = enabled
+    
+    if enabled and config.PROFILER_EXPORT_PATH:
+        profiler.start_export(config.PROFILER_EXPORT_PATH)
+    elif not enabled:
+        profiler.stop_export()
+
+def main(record_path=None, replay_path=None, seed=None):
+    """
+    Run the game
+
+    Args:
+        record_path: Write every frame's input and state checksum to this replay log
+        replay_path: Drive the game from this replay log instead of the keyboard,
+            checking the state checksum every frame
+        seed: Play an endlessly generated level from this seed instead of the level file
+    """
+    global is_paused, endless_seed
+    endless_seed = seed
     pygame.init()
     screen = pygame.display.set_mode((config.WINDOW_WIDTH, config.WINDOW_HEIGHT))
     pygame.display.set_caption("Platformer")
     clock = pygame.time.Clock()
 
     physics_world = PhysicsWorld()
-    camera = Camera(config.LEVEL_WIDTH, config.LEVEL_HEIGHT)
+    level = load_level_data()
+    camera = Camera(level.width, level.height)
+    view_culler = ViewCuller(camera, margin=32)  # Margin covers animated overdraw
+    simulation_lod = SimulationLOD(camera)
     ui = GameUI()
     
-    reset_game(physics_world)
+    load_level(physics_world, streamed=config.STREAMING_ENABLED)
     is_paused = False
 
     # Initialize background
-    background = ParallaxBackground()
-    background.add_layer("assets/backgrounds/sky.png", 2.0, TileMode.HORIZONTAL)
-    background.add_layer("assets/backgrounds/landscape5.png", 0.99, TileMode.NONE, scale=1.7, y_offset=-350)  
-    background.add_layer("assets/backgrounds/mountains2.png", 0.97, TileMode.NONE, scale=0.8, x_offset=-100, y_offset=250)
-    background.add_layer("assets/backgrounds/landscape2.png", 0.93, TileMode.HORIZONTAL, scale=0.8, x_offset=0, y_offset=50) 
-    background.add_layer("assets/backgrounds/landscape1.png", 0.92, TileMode.HORIZONTAL, scale=0.8, x_offset=0, y_offset=50) 
-    background.add_layer("assets/backgrounds/grass.png", 0.90, TileMode.NONE, scale=0.8, x_offset=0, y_offset=175) 
-    #background.add_layer("../assets/backgrounds/trees.png", 0.6, TileMode.HORIZONTAL)  # Trees tile horizontally
+    background = create_background()
+
+    # Stream background music
+    audio_manager.music.play()
+
+    # Gameplay input comes from the keyboard, optionally recorded, or from a replay
+    if replay_path:
+        input_source = ReplayInput(replay_path, config.PHYSICS_TICK_RATE)
+    else:
+        input_source = KeyboardInput()
+        if record_path:
+            input_source = InputRecorder(input_source, record_path, config.PHYSICS_TICK_RATE)
+    if record_path or replay_path:
+        # Which enemies fit in a wall-clock budget varies between runs, and so
+        # does which generated chunks are ready in time unless we wait for them
+        ai_scheduler.budget = None
+        if isinstance(level, GeneratedLevel):
+            level.blocking = True
     
     while True:
+        # Real time since the last frame drives the fixed-timestep simulation
+        frame_time = clock.tick(config.FPS) / 1000.0
+        profiler.begin_frame()
+
         # Always handle events, even when paused
-        for event in pygame.event.get():
+        events = pygame.event.get()
+        for event in events:
+            audio_manager.music.handle_event(event)
             if event.type == pygame.QUIT:
-                pygame.quit()
-                sys.exit()
+                quit_game(input_source)
             if event.type == pygame.KEYDOWN:
                 if event.key == pygame.K_ESCAPE:
-                    pygame.quit()
-                    sys.exit()
-                elif event.key == pygame.K_r and not is_paused:
-                    reset_game(physics_world, audio_manager)
-                elif event.key == pygame.K_p:
-                    handle_pause()
-                elif event.key == pygame.K_w and not is_paused:
-                    player.jump()
+                    quit_game(input_source)
+                elif event.key == pygame.K_F3:
+                    toggle_profiler(ui)
+        audio_manager.music.update()
+
+        if replay_path and input_source.finished:
+            print(f"Replay finished: {input_source.index} frames matched")
+            quit_game(input_source)
+
+        frame_input = input_source.poll(events, frame_time)
+        if frame_input.reset and not is_paused:
+            reset_game(physics_world)
+        if frame_input.pause:
+            handle_pause()
+        if frame_input.jump and not is_paused:
+            player.jump()
 
         # Only process game logic if not paused
         if not is_paused:
-            # Handle movement input
-            keys = pygame.key.get_pressed()
-            direction = 0
-            if keys[pygame.K_a]:
-                direction = -1
-            if keys[pygame.K_d]:
-                direction = 1
-            player.move(direction)
-
-            # Update physics world
-            physics_world.update()
-            
-            # Update game objects
-            player.update()
-            
-            for platform in platforms:
-                platform.update()
-            
-            # Check death zone
-            if player.rect.top >= DEATH_ZONE:
-                reset_game(physics_world)
-                audio_manager.play_sound('death')
-
-            camera.update(player)
-
-            for collectible in collectibles:
-                collectible.update(player)
-            
-            # Update enemies with physics
-            for enemy in enemies:
-                enemy.update(player)
-                if enemy.rect.colliderect(player.rect):
-                    reset_game(physics_world)
-                    audio_manager.play_sound('death')
+            update_physics(physics_world, frame_input.frame_time, frame_input.direction)
+            update_entities(physics_world, camera, simulation_lod)
+
+        input_source.end_frame(state_checksum)
 
         # Always update UI and draw
         ui.update_coin_count(player.coins)
@@ -148,26 +429,31 @@ def main():
         screen.fill(config.BLACK)
         
         # Draw background layers first
-        background.draw(screen, camera)
-    
-        # Draw platforms using their draw method
-        for platform in platforms:
-            platform.draw(screen, camera)
+        with profiler.scope('background'):
+            background.draw(screen, camera)
         
-        for collectible in collectibles:
-            collectible.draw(screen, camera)
-        
-        for enemy in enemies:
-            enemy.draw(screen, camera)
-        
-        if player.rect.top < DEATH_ZONE:
-            pygame.draw.rect(screen, config.RED, camera.apply(player.rect))
+        draw_entities(screen, camera, view_culler)
+
+        if profiler.enabled:
+            profiler.count('bodies', physics_world.world.bodyCount)
+            profiler.count('contacts', physics_world.world.contactCount)
+            profiler.count('active enemies', simulation_lod.active_count)
+            if level_streamer:
+                profiler.count('loaded chunks', len(level_streamer.loaded))
+            profiler.count('ai thinks/deferred', f"{ai_scheduler.think_count}/{ai_scheduler.deferred_count}")
+            profiler.count('text cache hits/misses', f"{text_cache.hits}/{text_cache.misses}")
 
         # Draw UI last, including pause overlay if paused
-        ui.draw(screen, is_paused)
+        with profiler.scope('ui'):
+            ui.draw(screen, is_paused)
 
         pygame.display.flip()
-        clock.tick(config.FPS)
+        profiler.end_frame()
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    parser = argparse.ArgumentParser(description="Word Rescue")
+    parser.add_argument('--record', help="Record input and state checksums to a replay log")
+    parser.add_argument('--replay', help="Replay a recorded log and verify it frame by frame")
+    parser.add_argument('--endless', type=int, metavar='SEED', help="Play an endless level generated from SEED")
+    args = parser.parse_args()
+    main(record_path=args.record, replay_path=args.replay, seed=args.endless)
\ No newline at end of file
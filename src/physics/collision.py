@@ -0,0 +1,39 @@
+from config import config
+
+# One Box2D category bit per configured collision layer, in config order
+CATEGORY_BITS = {name: 1 << index for index, name in enumerate(config.COLLISION_CATEGORIES)}
+
+def _mask_bits(category):
+    bits = 0
+    for other in config.COLLISION_MASKS.get(category, []):
+        if other not in CATEGORY_BITS:
+            raise ValueError(f"Unknown collision category '{other}' in mask for '{category}'")
+        bits |= CATEGORY_BITS[other]
+    return bits
+
+for _category in config.COLLISION_MASKS:
+    if _category not in CATEGORY_BITS:
+        raise ValueError(f"Collision mask given for unknown category '{_category}'")
+
+MASK_BITS = {name: _mask_bits(name) for name in CATEGORY_BITS}
+
+def check_collision_masks():
+    """Warn about mask pairs that only list each other one way round, which never collide"""
+    # Box2D only creates a contact when both fixtures' masks accept each other
+    for category, others in config.COLLISION_MASKS.items():
+        for other in others:
+            if category not in config.COLLISION_MASKS.get(other, []):
+                print(f"Warning: Collision mask for '{category}' includes '{other}' but not the other way round; "
+                      "they will not collide")
+
+def collision_filter(category):
+    """
+    Return fixture keyword arguments that put a fixture on a collision layer
+
+    Args:
+        category: Name of a category from config.json, or None for Box2D's
+            default filtering (collides with everything)
+    """
+    if category is None:
+        return {}
+    return {'categoryBits': CATEGORY_BITS[category], 'maskBits': MASK_BITS[category]}
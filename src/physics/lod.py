@@ -0,0 +1,52 @@
+from config import config
+
+class SimulationLOD:
+    def __init__(self, camera, activation_margin=config.LOD_ACTIVATION_MARGIN,
+                 deactivation_margin=config.LOD_DEACTIVATION_MARGIN):
+        """
+        Puts Box2D bodies far from the camera to sleep and wakes them when they come back
+
+        Args:
+            camera: Camera whose view the margins are measured from
+            activation_margin: Pixels around the view within which sleeping objects wake
+            deactivation_margin: Pixels around the view beyond which objects go to sleep.
+                Larger than activation_margin so objects on the boundary don't flicker.
+        """
+        self.camera = camera
+        self.activation_margin = activation_margin
+        self.deactivation_margin = max(deactivation_margin, activation_margin)
+        self.active_count = 0
+
+    def update(self, game_objects):
+        """Activate or deactivate each object's body based on its distance from the view"""
+        wake_area = self.camera.view.inflate(self.activation_margin * 2, self.activation_margin * 2)
+        keep_area = self.camera.view.inflate(self.deactivation_margin * 2, self.deactivation_margin * 2)
+
+        active_count = 0
+        for game_object in game_objects:
+            if game_object.simulated:
+                if not game_object.rect.colliderect(keep_area):
+                    self.deactivate(game_object)
+                else:
+                    active_count += 1
+            elif game_object.rect.colliderect(wake_area):
+                self.activate(game_object)
+                active_count += 1
+        self.active_count = active_count
+
+    def deactivate(self, game_object):
+        """Remove an object's body from the simulation, remembering its velocity"""
+        body = game_object.body
+        velocity = body.linearVelocity
+        game_object.sleep_velocity = (velocity.x, velocity.y)
+        body.active = False
+        game_object.simulated = False
+
+    def activate(self, game_object):
+        """Return a sleeping object's body to the simulation with its previous velocity"""
+        body = game_object.body
+        body.active = True
+        if game_object.sleep_velocity is not None:
+            body.linearVelocity = game_object.sleep_velocity
+        body.awake = True
+        game_object.simulated = True
@@ -0,0 +1,270 @@
+import bisect
+import heapq
+import math
+from config import config
+from .constants import *
+
+# Ways of getting from one platform to another
+WALK = 0
+JUMP = 1
+FALL = 2
+
+# Platforms whose tops are this close in height count as level with each other (pixels)
+LEVEL_TOLERANCE = 4
+# Widest gap between level platforms that can be walked over without jumping (pixels)
+MAX_WALK_GAP = 8
+# Horizontal distance kept from a platform's edge when jumping up past it or landing on it (pixels)
+EDGE_CLEARANCE = 30
+# Extra cost of a jump, so paths prefer walking and falling when they're about as short
+JUMP_COST = 50
+
+def jump_air_time(rise, gravity, jump_speed):
+    """
+    Seconds from taking off until a jump comes back down to `rise` above the takeoff height
+
+    Args:
+        rise: Height to land at above the takeoff point (negative for below)
+        gravity: Downward acceleration, in the same length unit as rise
+        jump_speed: Upward speed at takeoff, in the same length unit as rise
+
+    Returns:
+        The air time, or None if the jump never gets that high
+    """
+    discriminant = jump_speed * jump_speed - 2 * gravity * rise
+    if discriminant < 0:
+        return None
+    return (jump_speed + math.sqrt(discriminant)) / gravity
+
+class NavEdge:
+    __slots__ = ('source', 'target', 'kind', 'takeoff_x', 'landing_x', 'cost')
+
+    def __init__(self, source, target, kind, takeoff_x, landing_x, cost):
+        """
+        One way of moving from a platform to another
+
+        Args:
+            source: Index of the platform the move starts on
+            target: Index of the platform the move ends on
+            kind: WALK, JUMP or FALL
+            takeoff_x: x (pixels) on the source platform where the move starts
+            landing_x: x (pixels) on the target platform to aim for
+            cost: Approximate distance travelled in pixels
+        """
+        self.source = source
+        self.target = target
+        self.kind = kind
+        self.takeoff_x = takeoff_x
+        self.landing_x = landing_x
+        self.cost = cost
+
+class NavigationGraph:
+    def __init__(self, platforms, gravity=9.81, jump_speed=None, run_speed=None):
+        """
+        Graph of the moves between platforms, built once per level and updated
+        as platforms are streamed in and out
+
+        Args:
+            platforms: The level's platforms; their top surfaces are the graph's nodes
+            gravity: Downward acceleration in meters/second²
+            jump_speed: Upward speed a jump starts with in meters/second,
+                defaults to the player's jump force
+            run_speed: Horizontal speed in meters/second used to work out how far
+                a jump or fall can carry, defaults to the player's speed
+        """
+        self.jump_speed = jump_speed if jump_speed is not None else pixels_to_meters(config.JUMP_FORCE)
+        self.run_speed = run_speed if run_speed is not None else config.PLAYER_SPEED
+
+        # Work in pixels and seconds so arcs can be compared with platform rects directly
+        self._gravity = meters_to_pixels(gravity)
+        self._jump_speed = meters_to_pixels(self.jump_speed)
+        self._run_speed = meters_to_pixels(self.run_speed)
+        self.max_jump_height = self._jump_speed ** 2 / (2 * self._gravity)
+        # Only pairs within the longest possible fall's reach can be connected
+        self._max_reach = self._run_speed * (self._fall_time(config.LEVEL_HEIGHT) + 2 * self._jump_speed / self._gravity)
+
+        self.platforms = []  # Indexed by node; None for the free slots of removed platforms
+        self.index = {}  # Platform -> node index
+        self.edges = []
+        self._free = []  # Node indices of removed platforms, reused first
+        self._order = []  # (left x, node index) of every platform, sorted
+        self._max_width = 0
+        self._paths = {}  # (from index, to index) -> tuple of NavEdges, or None if unreachable
+        self.add_platforms(platforms)
+
+    def _fall_time(self, drop):
+        """Seconds to fall `drop` pixels from rest"""
+        return math.sqrt(2 * drop / self._gravity)
+
+    def _jump_time(self, rise):
+        """Seconds from taking off until coming back down to `rise` pixels above the takeoff height"""
+        return jump_air_time(rise, self._gravity, self._jump_speed)
+
+    def _neighbours(self, rect):
+        """Indices of the platforms close enough to a rect to be connected with it either way"""
+        reach = self._max_reach + self._max_width
+        start = bisect.bisect_left(self._order, (rect.left - reach, -1))
+        end = bisect.bisect_right(self._order, (rect.right + reach, math.inf))
+        return [index for _, index in self._order[start:end]]
+
+    def add_platforms(self, platforms):
+        """Add platforms to the graph, connecting them with the ones already in it"""
+        added = []
+        for platform in platforms:
+            if platform in self.index:
+                continue
+            if self._free:
+                i = self._free.pop()
+                self.platforms[i] = platform
+            else:
+                i = len(self.platforms)
+                self.platforms.append(platform)
+                self.edges.append([])
+            self.index[platform] = i
+            bisect.insort(self._order, (platform.rect.left, i))
+            self._max_width = max(self._max_width, platform.rect.width)
+            added.append(i)
+
+        new = set(added)
+        for i in added:
+            for j in self._neighbours(self.platforms[i].rect):
+                if j == i:
+                    continue
+                edge = self._connect(i, j)
+                if edge is not None:
+                    self.edges[i].append(edge)
+                if j not in new:
+                    # Moves between two new platforms are found from both ends' own loops
+                    edge = self._connect(j, i)
+                    if edge is not None:
+                        self.edges[j].append(edge)
+        if added:
+            self._paths.clear()
+
+    def remove_platforms(self, platforms):
+        """Take platforms and every move onto them out of the graph"""
+        removed = {self.index.pop(platform) for platform in platforms if platform in self.index}
+        if not removed:
+            return
+        for i in removed:
+            for j in self._neighbours(self.platforms[i].rect):
+                if j not in removed:
+                    self.edges[j] = [edge for edge in self.edges[j] if edge.target != i]
+        for i in removed:
+            entry = (self.platforms[i].rect.left, i)
+            del self._order[bisect.bisect_left(self._order, entry)]
+            self.platforms[i] = None
+            self.edges[i] = []
+            self._free.append(i)
+        self._paths.clear()
+
+    def _connect(self, i, j):
+        """Return the cheapest move from platform i onto platform j, or None if there is none"""
+        a, b = self.platforms[i].rect, self.platforms[j].rect
+        rise = a.top - b.top  # y grows downwards, so positive means b is higher
+
+        if abs(rise) <= LEVEL_TOLERANCE:
+            gap = max(b.left - a.right, a.left - b.right, 0)
+            takeoff_x, landing_x = (a.right, b.left) if b.centerx > a.centerx else (a.left, b.right)
+            if gap <= MAX_WALK_GAP:
+                return self._edge(i, j, WALK, takeoff_x, landing_x)
+            if gap <= self._run_speed * self._jump_time(0):
+                return self._edge(i, j, JUMP, takeoff_x, landing_x)
+            return None
+
+        if rise > 0:
+            # Jumping up: take off beside b, otherwise its underside is in the way
+            if rise > self.max_jump_height:
+                return None
+            options = []
+            if a.left < b.left:
+                options.append((min(a.right, b.left - EDGE_CLEARANCE), b.left + EDGE_CLEARANCE))
+            if a.right > b.right:
+                options.append((max(a.left, b.right + EDGE_CLEARANCE), b.right - EDGE_CLEARANCE))
+            reach = self._run_speed * self._jump_time(rise)
+            options = [option for option in options if abs(option[1] - option[0]) <= reach]
+            if not options:
+                return None
+            takeoff_x, landing_x = min(options, key=lambda option: abs(option[1] - option[0]))
+            return self._edge(i, j, JUMP, takeoff_x, landing_x)
+
+        # Dropping down: leave a over one of its edges, otherwise a is in the way
+        drop = -rise
+        options = []
+        if b.left < a.left:
+            options.append((a.left, min(b.right, a.left) - EDGE_CLEARANCE))
+        if b.right > a.right:
+            options.append((a.right, max(b.left, a.right) + EDGE_CLEARANCE))
+        options = [(takeoff_x, max(b.left, min(b.right, landing_x))) for takeoff_x, landing_x in options]
+        if not options:
+            return None
+        takeoff_x, landing_x = min(options, key=lambda option: abs(option[1] - option[0]))
+        gap = abs(landing_x - takeoff_x)
+        if gap <= self._run_speed * self._fall_time(drop):
+            return self._edge(i, j, FALL, takeoff_x, landing_x)
+        if gap <= self._run_speed * self._jump_time(rise):
+            return self._edge(i, j, JUMP, takeoff_x, landing_x)
+        return None
+
+    def _edge(self, i, j, kind, takeoff_x, landing_x):
+        a, b = self.platforms[i].rect, self.platforms[j].rect
+        # Walk to the takeoff point, cross over, then walk to the middle of the target.
+        # Never shorter than the straight line between the platforms' centers, which
+        # keeps the A* heuristic admissible.
+        cost = (abs(a.centerx - takeoff_x)
+                + math.hypot(landing_x - takeoff_x, b.top - a.top)
+                + abs(landing_x - b.centerx))
+        if kind == JUMP:
+            cost += JUMP_COST
+        return NavEdge(i, j, kind, takeoff_x, landing_x, cost)
+
+    def locate(self, game_object):
+        """Return the index of the platform a game object is standing on, or None"""
+        return self.index.get(game_object.ground_object)
+
+    def path(self, source, target):
+        """
+        Return the edges leading from platform `source` to platform `target`
+
+        Paths are searched with A* the first time a pair is asked for and cached
+        after that. Returns an empty tuple if source == target and None if the
+        target can't be reached.
+        """
+        key = (source, target)
+        if key not in self._paths:
+            self._paths[key] = self._search(source, target)
+        return self._paths[key]
+
+    def next_edge(self, source, target):
+        """Return the first edge on the path from `source` to `target`, or None"""
+        path = self.path(source, target)
+        return path[0] if path else None
+
+    def _heuristic(self, i, j):
+        a, b = self.platforms[i].rect, self.platforms[j].rect
+        return math.hypot(b.centerx - a.centerx, b.top - a.top)
+
+    def _search(self, source, target):
+        if source == target:
+            return ()
+
+        open_heap = [(self._heuristic(source, target), 0.0, source)]
+        best_cost = {source: 0.0}
+        came_by = {}  # Platform index -> edge it was reached by
+        while open_heap:
+            _, cost, node = heapq.heappop(open_heap)
+            if node == target:
+                path = []
+                while node != source:
+                    edge = came_by[node]
+                    path.append(edge)
+                    node = edge.source
+                return tuple(reversed(path))
+            if cost > best_cost[node]:
+                continue  # Stale heap entry
+            for edge in self.edges[node]:
+                new_cost = cost + edge.cost
+                if new_cost < best_cost.get(edge.target, math.inf):
+                    best_cost[edge.target] = new_cost
+                    came_by[edge.target] = edge
+                    heapq.heappush(open_heap, (new_cost + self._heuristic(edge.target, target), new_cost, edge.target))
+        return None
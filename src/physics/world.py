@@ -1,21 +1,130 @@
 import Box2D as b2
+from config import config
 from .constants import *
+from .collision import check_collision_masks, collision_filter
+
+# Minimum vertical component of a contact normal for it to count as standing on something
+GROUND_NORMAL_Y = 0.707  # cos(45°), allows for some slope
+
+class ContactDispatcher(b2.b2ContactListener):
+    """
+    Tracks grounded contacts and queues begin/end-contact events between game objects.
+    
+    Box2D calls BeginContact/EndContact while the world is locked, so events are only
+    queued here and handed to the game objects by dispatch() after the step.
+    """
+    def __init__(self):
+        super().__init__()
+        self.events = []
+        self._ground_contacts = {}  # (fixture key, fixture key) -> game object standing on the other
+        self._next_fixture_key = 0
+    
+    def _fixture_key(self, fixture):
+        if fixture.userData is None:
+            fixture.userData = self._next_fixture_key
+            self._next_fixture_key += 1
+        return fixture.userData
+    
+    def BeginContact(self, contact):
+        fixture_a, fixture_b = contact.fixtureA, contact.fixtureB
+        object_a, object_b = fixture_a.body.userData, fixture_b.body.userData
+        if object_a is None or object_b is None:
+            return
+        self.events.append((True, object_a, object_b))
+        
+        # Sensors have no manifold, so they never support anything
+        if fixture_a.sensor or fixture_b.sensor:
+            return
+        
+        # The world normal points from A to B; y grows downwards. Keep the world
+        # manifold alive while reading it: pybox2d's normal refers into it
+        world_manifold = contact.worldManifold
+        normal = world_manifold.normal
+        if normal.y > GROUND_NORMAL_Y:
+            grounded, ground = object_a, object_b
+        elif normal.y < -GROUND_NORMAL_Y:
+            grounded, ground = object_b, object_a
+        else:
+            return
+        
+        grounded.ground_contacts += 1
+        grounded.ground_object = ground
+        self._ground_contacts[(self._fixture_key(fixture_a), self._fixture_key(fixture_b))] = grounded
+    
+    def EndContact(self, contact):
+        fixture_a, fixture_b = contact.fixtureA, contact.fixtureB
+        object_a, object_b = fixture_a.body.userData, fixture_b.body.userData
+        if object_a is None or object_b is None:
+            return
+        self.events.append((False, object_a, object_b))
+        
+        if fixture_a.userData is None or fixture_b.userData is None:
+            return
+        grounded = self._ground_contacts.pop((fixture_a.userData, fixture_b.userData), None)
+        if grounded is not None:
+            grounded.ground_contacts -= 1
+            if grounded.ground_contacts <= 0:
+                grounded.ground_contacts = 0
+                grounded.ground_object = None
+    
+    def dispatch(self):
+        """Deliver queued contact events to both game objects involved"""
+        events = self.events
+        self.events = []
+        for began, object_a, object_b in events:
+            if began:
+                object_a.on_contact_begin(object_b)
+                object_b.on_contact_begin(object_a)
+            else:
+                object_a.on_contact_end(object_b)
+                object_b.on_contact_end(object_a)
 
 class PhysicsWorld:
     def __init__(self):
         # Create Box2D world with downward gravity
         self.world = b2.b2World(gravity=(0, 9.81))
+        check_collision_masks()
+        
+        # Collision events are reported through a contact listener
+        self.contact_dispatcher = ContactDispatcher()
+        self.world.contactListener = self.contact_dispatcher
         
         # Physics simulation settings
-        self.time_step = 1.0 / 60.0
+        self.time_step = 1.0 / config.PHYSICS_TICK_RATE
         self.vel_iters = 6
         self.pos_iters = 2
         
+        # Fixed-timestep accumulator
+        self.max_steps = config.MAX_PHYSICS_STEPS  # Catch-up cap per rendered frame
+        self.accumulator = 0.0
+        self.alpha = 1.0  # Fraction of a step between previous and current body states
+        
         # Debug drawing (optional)
         self.debug_draw = None
     
-    def create_static_body(self, x, y, width, height):
-        """Create a static body (for platforms)"""
+    def create_static_body(self, x, y, width, height, category='terrain'):
+        """Create a static body (for platforms) on a collision layer from config.json"""
+        body_def = b2.b2BodyDef()
+        body_def.position = to_box2d_coordinates((x + width/2, y + height/2))
+        
+        body = self.world.CreateBody(body_def)
+        
+        shape = b2.b2PolygonShape()
+        shape.SetAsBox(
+            pixels_to_meters(width/2),
+            pixels_to_meters(height/2)
+        )
+        
+        body.CreateFixture(
+            shape=shape,
+            friction=0.3,
+            **collision_filter(category)
+        )
+        
+        return body
+    
+    def create_sensor_body(self, x, y, width, height, category='pickup'):
+        """Create a static sensor body (for collectibles) that reports overlaps without colliding"""
         body_def = b2.b2BodyDef()
         body_def.position = to_box2d_coordinates((x + width/2, y + height/2))
         
@@ -29,12 +138,13 @@ class PhysicsWorld:
         
         body.CreateFixture(
             shape=shape,
-            friction=0.3
+            isSensor=True,
+            **collision_filter(category)
         )
         
         return body
     
-    def create_dynamic_body(self, x, y, width, height, density=1.0):
+    def create_dynamic_body(self, x, y, width, height, density=1.0, category=None):
         """Create a dynamic body (for players, enemies)"""
         body_def = b2.b2BodyDef()
         body_def.type = b2.b2_dynamicBody
@@ -52,11 +162,86 @@ class PhysicsWorld:
         body.CreateFixture(
             shape=shape,
             density=density,
-            friction=0.3
+            friction=0.3,
+            **collision_filter(category)
         )
         
         return body
 
-    def update(self):
+    def create_kinematic_body(self, x, y, width, height, category=None):
+        """
+        Create a kinematic body (for enemies following a path).
+        
+        Kinematic bodies move only by the velocity they are given, ignore gravity and
+        never touch static or other kinematic bodies, so they add no platform contacts.
+        """
+        body_def = b2.b2BodyDef()
+        body_def.type = b2.b2_kinematicBody
+        body_def.position = to_box2d_coordinates((x + width/2, y + height/2))
+        body_def.fixedRotation = True
+        
+        body = self.world.CreateBody(body_def)
+        
+        shape = b2.b2PolygonShape()
+        shape.SetAsBox(
+            pixels_to_meters(width/2),
+            pixels_to_meters(height/2)
+        )
+        
+        body.CreateFixture(
+            shape=shape,
+            density=1.0,
+            friction=0.3,
+            **collision_filter(category)
+        )
+        
+        return body
+
+    def destroy_body(self, body):
+        """Remove a body from the world; only call between steps"""
+        self.world.DestroyBody(body)
+
+    def step(self):
+        """Advance the simulation by exactly one fixed time step"""
+        # Remember where every moving object was so rendering can interpolate
+        for body in self.world.bodies:
+            if body.type != b2.b2_staticBody and body.userData is not None:
+                position = body.position
+                body.userData.previous_position = (position.x, position.y)
+        
         self.world.Step(self.time_step, self.vel_iters, self.pos_iters)
-        self.world.ClearForces()
\ No newline at end of file
+        self.world.ClearForces()
+    
+    def update(self, frame_time=None):
+        """
+        Advance the simulation by the real time elapsed since the last frame
+        
+        Args:
+            frame_time: Seconds since the last rendered frame. If None, a single
+                fixed step is taken.
+        
+        Returns:
+            Number of fixed steps taken
+        """
+        if frame_time is None:
+            self.step()
+            self.alpha = 1.0
+            self.contact_dispatcher.dispatch()
+            return 1
+        
+        self.accumulator += frame_time
+        steps = 0
+        while self.accumulator >= self.time_step and steps < self.max_steps:
+            self.step()
+            self.accumulator -= self.time_step
+            steps += 1
+        
+        # Too far behind to catch up: drop the backlog instead of spiralling
+        if steps == self.max_steps and self.accumulator >= self.time_step:
+            self.accumulator %= self.time_step
+        
+        self.alpha = self.accumulator / self.time_step
+        
+        # Hand collision events from this frame's steps to the game objects
+        self.contact_dispatcher.dispatch()
+        return steps
\ No newline at end of file
@@ -0,0 +1,311 @@
+"""
+Batch playtesting
+
+Plays a level many times with scripted or random agents, spread over worker
+processes that each run their own headless PhysicsWorld, and reports the
+completion rate, where players died and how long finishing took as JSON.
+Run from the repository root:
+
+    python src/playtest.py --runs 2000 --agent random --workers 8
+"""
+import argparse
+import json
+import math
+import os
+import random
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+# Select SDL's dummy drivers before pygame is imported anywhere
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+os.environ.setdefault('SDL_AUDIODRIVER', 'dummy')
+
+import pygame
+from config import config
+from core.camera import Camera
+from core.level_file import LevelData
+from entities.enemy import Goblin
+from physics.constants import to_box2d_coordinates
+from physics.navigation import WALK
+from physics.world import PhysicsWorld
+
+# Width of the buckets death locations are grouped into, in pixels
+DEATH_BUCKET_SIZE = 100
+
+class ScriptedAgent:
+    """Runs right and jumps at a steady rhythm; the same every run"""
+    def __init__(self, seed, jump_interval=40):
+        self.jump_interval = jump_interval
+
+    def __call__(self, frame, player):
+        return 1, frame % self.jump_interval == 0
+
+class RandomAgent:
+    """Holds a random direction for a while and jumps at random, leaning towards the right"""
+    def __init__(self, seed, jump_chance=0.05, right_bias=0.7):
+        self.random = random.Random(seed)
+        self.jump_chance = jump_chance
+        self.right_bias = right_bias
+        self.direction = 1
+        self.hold_frames = 0
+
+    def __call__(self, frame, player):
+        if self.hold_frames <= 0:
+            roll = self.random.random()
+            self.direction = 1 if roll < self.right_bias else -1 if roll < self.right_bias + 0.2 else 0
+            self.hold_frames = self.random.randint(10, 60)
+        self.hold_frames -= 1
+        return self.direction, self.random.random() < self.jump_chance
+
+AGENTS = {
+    'scripted': ScriptedAgent,
+    'random': RandomAgent,
+}
+
+# Per-process state, set up once by _init_worker and reused for every run
+_game = None
+_physics_world = None
+_camera = None
+
+def _init_worker():
+    """Build the level once in each worker process"""
+    global _game, _physics_world, _camera
+    pygame.init()
+    import main as game  # Imported here so each process gets its own level globals
+    _game = game
+    _physics_world = PhysicsWorld()
+    level = game.load_level_data()
+    _camera = Camera(level.width, level.height)
+    game.ai_scheduler.budget = None  # Keep runs reproducible from their seed
+    game.load_level(_physics_world)
+
+def play_run(agent_name, seed, max_frames, finish_x):
+    """
+    Play the level once from the start until the player finishes, dies or runs out of time
+
+    Args:
+        agent_name: Key into AGENTS picking the policy that drives the player
+        seed: Seed for the agent's random choices
+        max_frames: Frames (fixed physics steps) before the run counts as timed out
+        finish_x: The run is finished once the player's right edge reaches this x
+    """
+    game, physics_world = _game, _physics_world
+    game.reset_game(physics_world)
+    physics_world.accumulator = 0.0
+    agent = AGENTS[agent_name](seed)
+
+    # Every frame advances exactly one fixed physics step
+    frame_time = physics_world.time_step
+    for frame in range(max_frames):
+        direction, jump = agent(frame, game.player)
+        if jump:
+            game.player.jump()
+        game.update_physics(physics_world, frame_time, direction)
+        death_position = game.update_entities(physics_world, _camera)
+
+        if death_position is not None:
+            return {'seed': seed, 'outcome': 'died', 'frames': frame + 1, 'death_position': death_position}
+        if game.player.rect.right >= finish_x:
+            return {'seed': seed, 'outcome': 'finished', 'frames': frame + 1}
+    return {'seed': seed, 'outcome': 'timeout', 'frames': max_frames}
+
+def check_jump(settle_frames=240, rise_frames=15, min_rise=20):
+    """
+    Regression check that the player lands on the ground and can jump off it
+
+    Returns:
+        None if the player jumped, otherwise a message describing what went wrong
+    """
+    if _game is None:
+        _init_worker()
+    game, physics_world = _game, _physics_world
+    game.reset_game(physics_world)
+    physics_world.accumulator = 0.0
+
+    frame_time = physics_world.time_step
+    for _ in range(settle_frames):
+        game.update_physics(physics_world, frame_time, 0)
+        game.update_entities(physics_world, _camera)
+    player = game.player
+    if player.ground_contacts <= 0 or player.ground_object is None:
+        return f"player is not grounded after {settle_frames} frames (ground_contacts={player.ground_contacts})"
+
+    start_top = player.rect.top
+    player.jump()
+    for _ in range(rise_frames):
+        game.update_physics(physics_world, frame_time, 0)
+        game.update_entities(physics_world, _camera)
+    rise = start_top - player.rect.top
+    if rise < min_rise:
+        return f"jumping only raised the player {rise} pixels"
+    return None
+
+def _place_on(game_object, platform):
+    """Put a game object at rest on top of the middle of a platform"""
+    rect = platform.rect
+    game_object.body.position = to_box2d_coordinates((rect.centerx, rect.top - game_object.height / 2))
+    game_object.body.linearVelocity = (0, 0)
+    game_object.body.awake = True
+
+def check_chase(max_frames=600):
+    """
+    Regression check that a chasing Goblin follows the navigation graph onto
+    another platform, jumping or dropping on the way
+
+    Returns:
+        None if the Goblin got there, otherwise a message describing what went wrong
+    """
+    if _game is None:
+        _init_worker()
+    game, physics_world = _game, _physics_world
+    game.reset_game(physics_world)
+    physics_world.accumulator = 0.0
+
+    graph = game.navigation_graph
+    goblin = next((enemy for enemy in game.enemies if isinstance(enemy, Goblin)), None)
+    edge = next((edge for edges in graph.edges for edge in edges if edge.kind != WALK), None)
+    if goblin is None or edge is None:
+        return "level needs a Goblin and a jump or drop between platforms"
+
+    # Only the Goblin and the player take part; the snapshot puts everything back afterwards
+    for enemy in game.enemies:
+        if enemy is not goblin:
+            enemy.body.active = False
+    detection_radius = goblin.detection_radius
+    goblin.detection_radius = math.inf
+    goblin.set_kinematic(False)
+    _place_on(goblin, graph.platforms[edge.source])
+    _place_on(game.player, graph.platforms[edge.target])
+
+    moves = []
+    try:
+        frame_time = physics_world.time_step
+        for _ in range(max_frames):
+            game.update_physics(physics_world, frame_time, 0)
+            if game.update_entities(physics_world, _camera) is not None:
+                break  # Caught the player before standing on their platform
+            current = goblin.chase_strategy.edge
+            if current is not None and current not in moves:
+                moves.append(current)
+            if graph.locate(goblin) == edge.target:
+                if any(move.kind != WALK for move in moves):
+                    return None
+                return f"Goblin reached platform {edge.target} without jumping or dropping"
+        return f"Goblin did not reach platform {edge.target} from {edge.source} (moves: {[move.kind for move in moves]})"
+    finally:
+        goblin.detection_radius = detection_radius
+        game.reset_game(physics_world)
+
+def play_batch(agent_name, seeds, max_frames, finish_x):
+    """Play one run per seed inside a worker process"""
+    return [play_run(agent_name, seed, max_frames, finish_x) for seed in seeds]
+
+def summarize_times(frames, time_step):
+    """Return summary statistics (in seconds) for a list of frame counts"""
+    if not frames:
+        return None
+    ordered = sorted(frames)
+    count = len(ordered)
+
+    def percentile(p):
+        return ordered[min(count - 1, int(p * count))] * time_step
+
+    return {
+        'mean_s': sum(ordered) * time_step / count,
+        'min_s': ordered[0] * time_step,
+        'p50_s': percentile(0.50),
+        'p95_s': percentile(0.95),
+        'max_s': ordered[-1] * time_step,
+    }
+
+def aggregate(results, time_step):
+    """Combine individual run results into the playtest report"""
+    outcomes = {'finished': 0, 'died': 0, 'timeout': 0}
+    death_buckets = {}
+    finish_frames = []
+    for result in results:
+        outcomes[result['outcome']] += 1
+        if result['outcome'] == 'died':
+            bucket = int(result['death_position'][0] // DEATH_BUCKET_SIZE) * DEATH_BUCKET_SIZE
+            death_buckets[bucket] = death_buckets.get(bucket, 0) + 1
+        elif result['outcome'] == 'finished':
+            finish_frames.append(result['frames'])
+
+    runs = len(results)
+    return {
+        'runs': runs,
+        'completion_rate': outcomes['finished'] / runs if runs else 0.0,
+        'outcomes': outcomes,
+        'time_to_finish': summarize_times(finish_frames, time_step),
+        # Deaths per DEATH_BUCKET_SIZE-wide strip of the level, keyed by the strip's left x
+        'deaths_by_x': {str(x): death_buckets[x] for x in sorted(death_buckets)},
+    }
+
+def run_playtest(agent_name, runs, workers=None, max_frames=3600, finish_x=None, seed=0, batch_size=50):
+    """
+    Play the level `runs` times across a pool of worker processes
+
+    Args:
+        agent_name: Key into AGENTS picking the policy that drives the player
+        runs: Number of independent runs
+        workers: Worker process count, defaults to the number of CPUs
+        max_frames: Frames before a run counts as timed out
+        finish_x: Finish line x in pixels, defaults to 100 pixels before the level's right edge
+        seed: First run seed; runs use consecutive seeds so results are reproducible
+        batch_size: Runs sent to a worker at a time, to keep inter-process traffic low
+    """
+    finish_x = finish_x if finish_x is not None else LevelData.load(config.LEVEL_FILE).width - 100
+    seeds = list(range(seed, seed + runs))
+    batches = [seeds[i:i + batch_size] for i in range(0, runs, batch_size)]
+
+    start = time.perf_counter()
+    results = []
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker) as executor:
+        futures = [executor.submit(play_batch, agent_name, batch, max_frames, finish_x) for batch in batches]
+        for future in futures:
+            results.extend(future.result())
+    elapsed = time.perf_counter() - start
+
+    report = aggregate(results, 1.0 / config.PHYSICS_TICK_RATE)
+    report.update({
+        'agent': agent_name,
+        'workers': workers or os.cpu_count(),
+        'max_frames': max_frames,
+        'finish_x': finish_x,
+        'wall_time_s': elapsed,
+    })
+    return report
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Batch playtest a level with simulated players")
+    parser.add_argument('--runs', type=int, default=1000, help="Number of runs to play")
+    parser.add_argument('--agent', choices=sorted(AGENTS), default='random', help="Policy driving the player")
+    parser.add_argument('--workers', type=int, help="Worker processes (default: one per CPU)")
+    parser.add_argument('--max-frames', type=int, default=3600, help="Frames before a run times out")
+    parser.add_argument('--finish-x', type=int, help="Finish line x in pixels")
+    parser.add_argument('--seed', type=int, default=0, help="Seed of the first run")
+    parser.add_argument('--output', help="Write the JSON report to this file instead of stdout")
+    parser.add_argument('--check', action='store_true',
+                        help="Only check that the player can jump and a Goblin can chase it across platforms, then exit")
+    args = parser.parse_args(argv)
+
+    if args.check:
+        failed = False
+        for name, check in (('Jump', check_jump), ('Chase', check_chase)):
+            error = check()
+            print(f"{name} check failed: {error}" if error else f"{name} check passed")
+            failed = failed or error is not None
+        sys.exit(1 if failed else 0)
+
+    report = run_playtest(args.agent, args.runs, args.workers, args.max_frames, args.finish_x, args.seed)
+
+    text = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, 'w') as f:
+            f.write(text)
+    else:
+        print(text)
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
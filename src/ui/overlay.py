@@ -1,10 +1,13 @@
 import pygame
 from config import config
+from core.profiler import profiler
+from .text_cache import text_cache
 
 class GameUI:
     def __init__(self):
-        self.font = pygame.font.Font(None, 36)  # Default pygame font, size 36
-        self.coin_count = 0
+        self.font_size = 36  # Default pygame font, size 36
+        self.coin_count = None
+        self.coin_surface = None
         
         # Position for coin counter (top-left corner with padding)
         self.coin_counter_pos = (20, 20)
@@ -14,31 +17,58 @@ class GameUI:
         self.shadow_color = config.BLACK
         
         # Pause overlay setup
-        self.pause_font = pygame.font.Font(None, 72)  # Larger font for pause text
         self.pause_surface = pygame.Surface((config.WINDOW_WIDTH, config.WINDOW_HEIGHT))
         self.pause_surface.fill(config.BLACK)
         self.pause_surface.set_alpha(76)  # 30% opacity (76 is ~30% of 255)
         
         # Create pause text
-        self.pause_text = self.pause_font.render("PAUSED", True, config.WHITE)
+        self.pause_text = text_cache.render("PAUSED", 72, config.WHITE)
         self.pause_text_rect = self.pause_text.get_rect(
             center=(config.WINDOW_WIDTH // 2, config.WINDOW_HEIGHT // 2)
         )
         
+        # Frame profiler overlay setup
+        self.show_profiler = False
+        self.profiler_font = pygame.font.Font(None, 20)
+        self.profiler_pos = (config.WINDOW_WIDTH - 300, 10)
+        self.profiler_line_height = 16
+        
+        self.update_coin_count(0)
+        
     def update_coin_count(self, count):
+        # Only look up a new surface when the count actually changes
+        if count == self.coin_count:
+            return
         self.coin_count = count
+        self.coin_surface = text_cache.render(
+            f"Coins: {count}", self.font_size, self.text_color, shadow_color=self.shadow_color
+        )
         
-    def draw(self, screen, is_paused=False):
-        # Draw coin counter with shadow effect
-        coin_text = f"Coins: {self.coin_count}"
+    def draw_profiler(self, screen):
+        """Draw rolling p50/p95/p99 per profiler scope and the latest counters"""
+        lines = ["scope           p50    p95    p99 ms"]
+        for name, (p50, p95, p99) in sorted(profiler.stats().items()):
+            lines.append(f"{name[:14]:<14} {p50:6.2f} {p95:6.2f} {p99:6.2f}")
+        for name, value in profiler.counters.items():
+            lines.append(f"{name}: {value}")
         
-        # Draw shadow
-        shadow_surface = self.font.render(coin_text, True, self.shadow_color)
-        screen.blit(shadow_surface, (self.coin_counter_pos[0] + 2, self.coin_counter_pos[1] + 2))
+        # Dark panel behind the text so it stays readable over the level
+        x, y = self.profiler_pos
+        panel = pygame.Surface((290, len(lines) * self.profiler_line_height + 8))
+        panel.fill(config.BLACK)
+        panel.set_alpha(160)
+        screen.blit(panel, (x - 4, y - 4))
+        
+        for i, line in enumerate(lines):
+            text_surface = self.profiler_font.render(line, True, self.text_color)
+            screen.blit(text_surface, (x, y + i * self.profiler_line_height))
+        
+    def draw(self, screen, is_paused=False):
+        # Draw coin counter (pre-composited with its shadow)
+        screen.blit(self.coin_surface, self.coin_counter_pos)
         
-        # Draw text
-        text_surface = self.font.render(coin_text, True, self.text_color)
-        screen.blit(text_surface, self.coin_counter_pos)
+        if self.show_profiler:
+            self.draw_profiler(screen)
         
         # Draw pause overlay if game is paused
         if is_paused:
@@ -0,0 +1,64 @@
+from collections import OrderedDict
+import pygame
+
+class TextCache:
+    def __init__(self, max_entries=256):
+        """
+        Bounded LRU cache of rendered text surfaces
+
+        Args:
+            max_entries: Number of rendered surfaces kept before the least
+                recently used one is evicted
+        """
+        self.max_entries = max_entries
+        self.entries = OrderedDict()
+        self.fonts = {}
+        self.hits = 0
+        self.misses = 0
+
+    def get_font(self, font_name, size):
+        """Return a shared Font for (font_name, size); None is pygame's default font"""
+        key = (font_name, size)
+        font = self.fonts.get(key)
+        if font is None:
+            font = self.fonts[key] = pygame.font.Font(font_name, size)
+        return font
+
+    def render(self, text, size, color, font_name=None, antialias=True, shadow_color=None, shadow_offset=2):
+        """
+        Return a surface with the rendered text, re-rendering only on a cache miss
+
+        If shadow_color is given the surface is pre-composited with a drop shadow
+        shadow_offset pixels down and right of the text, which sits at (0, 0).
+        """
+        key = (font_name, size, text, color, antialias, shadow_color, shadow_offset)
+        surface = self.entries.get(key)
+        if surface is not None:
+            self.entries.move_to_end(key)
+            self.hits += 1
+            return surface
+
+        self.misses += 1
+        font = self.get_font(font_name, size)
+        text_surface = font.render(text, antialias, color)
+        if shadow_color is None:
+            surface = text_surface
+        else:
+            shadow_surface = font.render(text, antialias, shadow_color)
+            width, height = text_surface.get_size()
+            surface = pygame.Surface((width + shadow_offset, height + shadow_offset), pygame.SRCALPHA)
+            surface.blit(shadow_surface, (shadow_offset, shadow_offset))
+            surface.blit(text_surface, (0, 0))
+
+        self.entries[key] = surface
+        if len(self.entries) > self.max_entries:
+            self.entries.popitem(last=False)
+        return surface
+
+    def clear(self):
+        self.entries.clear()
+        self.hits = 0
+        self.misses = 0
+
+# Create a global instance
+text_cache = TextCache()